@@ -1,41 +1,12 @@
-from flask import Flask, send_from_directory #type:ignore
-from config import Config
-from flask_cors import CORS  # type: ignore
-from models.extensions import db   # type: ignore
-from flask_jwt_extended import JWTManager  # type: ignore
-from utils.auth import login_bp, register_bp
-from routes.voice_routes import voice_bp
-from routes.schemes_routes import schemes_bp
-from routes.bns_routes import bns_bp
-import os
-app = Flask(__name__)
-app.config.from_object(Config)
-
-CORS(app, resources={r"/*": {"origins": "http://localhost:5173"}}, supports_credentials=True)
-
-STATIC_DIR = os.path.join(os.path.dirname(__file__), 'static')
-
-@app.route('/')
-def home():
-    return "Welcome to the API!"
-
-app.register_blueprint(login_bp, url_prefix='/api')
-app.register_blueprint(register_bp, url_prefix='/api')
-app.register_blueprint(voice_bp, url_prefix='/api')
-app.register_blueprint(schemes_bp, url_prefix='/api')
-app.register_blueprint(bns_bp, url_prefix='/api')
-
-
-@app.route('/static/<filename>')
-def serve_static(filename):
-    return send_from_directory(STATIC_DIR, filename)
-
-
-db.init_app(app)
-jwt = JWTManager(app)
-
-with app.app_context():
-    db.create_all()
+# app.py
+#
+# Development server: python app.py. The Flask app itself lives in
+# application.py (gunicorn serves it through wsgi.py). It is imported only
+# when this script runs, because the PDF render processes re-import the
+# script that started the server (as __mp_main__) and must not load the app
+# and its models along with it.
 
 if __name__ == '__main__':
+    from application import app, start_background_work
+    start_background_work()
     app.run(debug=True)
@@ -0,0 +1,63 @@
+from flask import Flask, jsonify, send_from_directory #type:ignore
+from config import Config
+from flask_cors import CORS  # type: ignore
+from models.extensions import db   # type: ignore
+from flask_jwt_extended import JWTManager  # type: ignore
+from utils.auth import login_bp, register_bp
+from routes.voice_routes import voice_bp
+from routes.schemes_routes import schemes_bp
+from routes.bns_routes import bns_bp
+from routes.system_routes import system_bp, health_bp
+from routes.job_routes import job_bp
+from utils.job_queue import job_queue
+from mlModel.artifacts import artifact_store
+from mlModel.warmup import start_warmup
+import os
+app = Flask(__name__)
+app.config.from_object(Config)
+
+CORS(app, resources={r"/*": {"origins": "http://localhost:5173"}}, supports_credentials=True)
+
+STATIC_DIR = os.path.join(os.path.dirname(__file__), 'static')
+
+@app.route('/')
+def home():
+    return "Welcome to the API!"
+
+app.register_blueprint(login_bp, url_prefix='/api')
+app.register_blueprint(register_bp, url_prefix='/api')
+app.register_blueprint(voice_bp, url_prefix='/api')
+app.register_blueprint(schemes_bp, url_prefix='/api')
+app.register_blueprint(bns_bp, url_prefix='/api')
+app.register_blueprint(system_bp, url_prefix='/api')
+app.register_blueprint(job_bp, url_prefix='/api')
+app.register_blueprint(health_bp)
+
+
+@app.route('/static/<filename>')
+def serve_static(filename):
+    # Deferred PDFs/MP3s are rendered on their first download
+    if not os.path.exists(os.path.join(STATIC_DIR, filename)):
+        try:
+            artifact_store.materialize(filename)
+        except Exception as e:
+            print(f"❌ Rendering {filename} failed: {e}")
+            return jsonify({'error': f'Could not generate {filename}'}), 500
+    return send_from_directory(STATIC_DIR, filename)
+
+
+db.init_app(app)
+jwt = JWTManager(app)
+
+with app.app_context():
+    db.create_all()
+
+# Started by the entry points (app.py, wsgi.py), not on import: under the pre-fork server each
+# worker calls it after the fork (serving.py)
+def start_background_work():
+    # Pick up complaint jobs a previous run did not finish
+    job_queue.resume()
+
+    # Fonts, models and the PDF workers are warmed before /readyz reports ready
+    if Config.WARMUP_ON_STARTUP:
+        start_warmup()
@@ -0,0 +1,126 @@
+# asr_benchmark.py
+#
+# Real-time factor and word error rate of an ASR configuration on the
+# fixture set in benchmarks/fixtures/asr/manifest.jsonl. Each fixture is a
+# short complaint spoken in one of the supported languages with an English
+# reference (the pipelines transcribe with task="translate"). The audio is
+# not committed: it is synthesized from the manifest text on first run with
+# the local eSpeak NG backend (no network), which gives the same audio for
+# the same espeak-ng version on every machine; the version is printed with
+# the results. Audio from another TTS backend (--tts) is kept in its own
+# directory so its numbers are never mixed with the pinned set.
+#
+#   cd Backend && python -m benchmarks.asr_benchmark --backend whisper --model-size small --quantize int8 --threads 4 --profile fast
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import time
+from config import Config
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "asr")
+MANIFEST = os.path.join(FIXTURES_DIR, "manifest.jsonl")
+SAMPLE_RATE = 16000
+
+def load_manifest():
+    with open(MANIFEST, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def audio_dir(tts_backend):
+    return os.path.join(FIXTURES_DIR, tts_backend)
+
+def synthesizer_version(tts_backend):
+    if tts_backend != "espeak":
+        return tts_backend
+    return subprocess.run(["espeak-ng", "--version"], check=True, capture_output=True, text=True).stdout.strip()
+
+def synthesize_missing(fixtures, tts_backend):
+    from mlModel.tts_backends import get_backend
+    engine = get_backend(tts_backend)
+    os.makedirs(audio_dir(tts_backend), exist_ok=True)
+    for fixture in fixtures:
+        path = os.path.join(audio_dir(tts_backend), f"{fixture['id']}.mp3")
+        if not os.path.exists(path):
+            print(f"⏳ Synthesizing {fixture['id']} with {engine.name}")
+            engine.synthesize(fixture["text"], fixture["lang"], path)
+
+def _words(text):
+    return re.sub(r"[^\w\s]", " ", text.lower()).split()
+
+def word_errors(reference, hypothesis):
+    """Word-level edit distance between the two texts, and the reference length."""
+    ref, hyp = _words(reference), _words(hypothesis)
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1], len(ref)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ASR real-time factor and word error rate")
+    parser.add_argument("--backend", default=Config.ASR_BACKEND, help="whisper or faster-whisper")
+    parser.add_argument("--model-size", default=Config.WHISPER_MODEL_SIZE, help="tiny, base, small, medium...")
+    parser.add_argument("--quantize", default=Config.ASR_QUANTIZE or "none", choices=["none", "int8"])
+    parser.add_argument("--threads", type=int, default=Config.ASR_THREADS)
+    parser.add_argument("--profile", default="balanced", choices=["fast", "balanced", "accurate"],
+                        help="decoding profile (the request's quality field)")
+    parser.add_argument("--tts", default="espeak",
+                        help="TTS backend that synthesizes the fixture audio (espeak, local, is the reference set)")
+    args = parser.parse_args()
+
+    # The registry reads these when the model is loaded
+    Config.ASR_BACKEND = args.backend
+    Config.WHISPER_MODEL_SIZE = args.model_size
+    Config.ASR_QUANTIZE = None if args.quantize == "none" else args.quantize
+    Config.ASR_THREADS = args.threads
+
+    import whisper  # type: ignore
+    if args.threads:
+        # openai-whisper runs on torch's process-wide pool (what WORKER_TORCH_THREADS sets in a worker)
+        import torch  # type: ignore
+        torch.set_num_threads(args.threads)
+    from mlModel.asr_backends import get_asr_backend
+    from mlModel.model_registry import get_model, resident_models
+
+    fixtures = load_manifest()
+    synthesize_missing(fixtures, args.tts)
+
+    backend = get_asr_backend()
+    started = time.perf_counter()
+    get_model(backend.model_name)
+    load_seconds = time.perf_counter() - started
+    # One untimed pass so lazy initialisation is not charged to the first fixture
+    backend.transcribe(whisper.audio.load_audio(os.path.join(audio_dir(args.tts), f"{fixtures[0]['id']}.mp3")))
+
+    print(f"{backend.name} {args.model_size} quantize={args.quantize} threads={args.threads or 'default'}"
+          f" profile={args.profile}"
+          f" (loaded in {load_seconds:.1f}s)")
+    print(f"fixture audio: {synthesizer_version(args.tts)}")
+    print(f"{'fixture':<14}{'lang':>6}{'audio s':>9}{'decode s':>10}{'RTF':>7}{'WER':>7}")
+    total_audio = total_decode = total_errors = total_words = 0
+    for fixture in fixtures:
+        # Decoding the file is the same for every engine, so it is kept out of the timing
+        audio = whisper.audio.load_audio(os.path.join(audio_dir(args.tts), f"{fixture['id']}.mp3"))
+        duration = len(audio) / SAMPLE_RATE
+        started = time.perf_counter()
+        result = backend.transcribe(audio, task="translate", profile=args.profile)
+        decode = time.perf_counter() - started
+        errors, words = word_errors(fixture["reference"], result["text"])
+        total_audio += duration
+        total_decode += decode
+        total_errors += errors
+        total_words += words
+        print(f"{fixture['id']:<14}{fixture['lang']:>6}{duration:>9.1f}{decode:>10.2f}"
+              f"{decode / duration:>7.2f}{errors / max(words, 1):>7.2f}")
+    print(f"{'overall':<14}{'':>6}{total_audio:>9.1f}{total_decode:>10.2f}"
+          f"{total_decode / total_audio:>7.2f}{total_errors / max(total_words, 1):>7.2f}")
+    rss = resident_models()["process_rss_bytes"]
+    if rss is not None:
+        print(f"process RSS: {rss / 2**20:.0f} MiB")
+
+if __name__ == "__main__":
+    main()
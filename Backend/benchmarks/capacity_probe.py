@@ -0,0 +1,119 @@
+# capacity_probe.py
+#
+# Sizing for the pre-fork server. Loads every model the way the gunicorn
+# master does (serving.preload), forks one probe worker, warms it and drives
+# the text pipelines (section classification + scheme recommendation) from
+# SERVER_THREADS concurrent threads, then reports the shared model memory,
+# the per-worker unshared memory, the single-worker throughput and the
+# worker count / recycling limit this machine can afford.
+#
+#   cd Backend && python -m benchmarks.capacity_probe --torch-threads 2 --seconds 20
+
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+import serving
+
+QUERIES = [
+    "Someone snatched my phone and purse at the bus stand and threatened me with a knife.",
+    "My landlord locked me out of my house and kept my belongings.",
+    "My neighbour beat my son and broke his arm during an argument over water.",
+    "A man has been following my daughter to school and sending her threatening messages.",
+]
+SAMPLE_PROFILE = {"gender": "female", "caste": "sc", "income": 150000, "occupation": "student", "state": "delhi", "age": 19}
+# Per-worker memory grows with traffic (allocator caches, batches in flight); size with this headroom
+GROWTH_HEADROOM = 1.5
+
+def mem_available_bytes():
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def _probe_worker(conn, torch_threads, seconds, clients):
+    import torch  # type: ignore
+    from mlModel.warmup import warmup
+    from mlModel.voice_assistant import classify_ipc
+    from mlModel.bns_sections import classify_bns
+    from mlModel.schemes import recommend_schemes
+    torch.set_num_threads(torch_threads)
+
+    started = time.perf_counter()
+    warmup()
+    warmup_seconds = time.perf_counter() - started
+    warmed_private = serving.private_bytes()
+
+    def request(i):
+        query = QUERIES[i % len(QUERIES)]
+        classify_ipc(query)
+        classify_bns(query)
+        recommend_schemes(query, SAMPLE_PROFILE)
+
+    done = 0
+    deadline = time.perf_counter() + seconds
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        while time.perf_counter() < deadline:
+            list(pool.map(request, range(done, done + clients)))
+            done += clients
+    conn.send({
+        "warmup_seconds": warmup_seconds,
+        "warmed_private_bytes": warmed_private,
+        "loaded_private_bytes": serving.private_bytes(),
+        "requests_per_second": done / (time.perf_counter() - started),
+    })
+    conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure memory and throughput to size the pre-fork server")
+    parser.add_argument("--torch-threads", type=int, default=2, help="intra-op threads of the probe worker")
+    parser.add_argument("--seconds", type=float, default=20, help="duration of the load phase")
+    parser.add_argument("--clients", type=int, default=Config.SERVER_THREADS, help="concurrent request threads")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    available = mem_available_bytes()
+    before = serving.private_bytes()
+    # Measured in the probe itself: everything the master holds is shared with the workers
+    Config.PREFORK = True
+    serving.preload()
+    shared = serving.private_bytes() - before
+
+    parent_conn, child_conn = multiprocessing.Pipe()
+    worker = multiprocessing.get_context("fork").Process(
+        target=_probe_worker, args=(child_conn, args.torch_threads, args.seconds, args.clients)
+    )
+    worker.start()
+    report = parent_conn.recv()
+    worker.join()
+
+    per_worker = report["loaded_private_bytes"]
+    by_cpu = max(1, cpus // args.torch_threads)
+    by_memory = int((available - shared) // (per_worker * GROWTH_HEADROOM)) if available else by_cpu
+    workers = max(1, min(by_cpu, by_memory))
+
+    print(f"CPUs: {cpus}, memory available: {available / 2**30:.1f} GiB" if available else f"CPUs: {cpus}")
+    print(f"shared model memory (master):      {shared / 2**20:>8.0f} MiB")
+    print(f"unshared memory per worker, warm:   {report['warmed_private_bytes'] / 2**20:>8.0f} MiB")
+    print(f"unshared memory per worker, loaded: {per_worker / 2**20:>8.0f} MiB")
+    print(f"warmup per worker:                  {report['warmup_seconds']:>8.1f} s")
+    print(f"text requests/s per worker:         {report['requests_per_second']:>8.1f}"
+          f" ({args.clients} clients, {args.torch_threads} torch threads)")
+    print(f"workers: {by_cpu} fit the CPUs, {by_memory} fit the memory")
+    print(f"estimated capacity: {workers * report['requests_per_second']:.1f} text requests/s")
+    print()
+    print("Suggested Config:")
+    print(f"    SERVER_WORKERS = {workers}")
+    print(f"    SERVER_THREADS = {args.clients}")
+    print(f"    WORKER_TORCH_THREADS = {args.torch_threads}")
+    print(f"    WORKER_MAX_PRIVATE_BYTES = {int(per_worker * GROWTH_HEADROOM * 2**-20)} * 1024 * 1024")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# encoder_benchmark.py
+#
+# Queries per second of a sentence encoder under concurrent load, once with
+# every thread calling model.encode itself (batch size 1) and once through
+# the micro-batching encoder service, plus the batch-size histogram.
+#
+#   cd Backend && python -m benchmarks.encoder_benchmark --model scheme_encoder --clients 16 --requests 400
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from mlModel.model_registry import get_model
+from mlModel.encoders import encode, get_encoder
+
+QUERIES = [
+    "I am a 19-year-old female student from Delhi belonging to the SC caste.",
+    "Someone snatched my phone and purse at the bus stand and threatened me with a knife.",
+    "My landlord locked me out of my house and kept my belongings.",
+    "Scholarship for girls from minority communities studying in college",
+    "Pension for a widow with no income living in a village",
+    "My neighbour beat my son and broke his arm during an argument over water.",
+]
+
+def run(encode_one, clients, requests):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(lambda i: encode_one(QUERIES[i % len(QUERIES)]), range(requests)))
+    return requests / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched vs unbatched query encoding")
+    parser.add_argument("--model", default="scheme_encoder", choices=["query_encoder", "scheme_encoder", "multilingual_encoder"])
+    parser.add_argument("--clients", type=int, default=16, help="concurrent request threads")
+    parser.add_argument("--requests", type=int, default=400)
+    args = parser.parse_args()
+
+    model = get_model(args.model)
+    # Untimed passes so lazy initialisation is not charged to either mode
+    model.encode(QUERIES[0], convert_to_tensor=True)
+    encode(args.model, QUERIES[0])
+
+    unbatched = run(lambda text: model.encode(text, convert_to_tensor=True), args.clients, args.requests)
+    batched = run(lambda text: encode(args.model, text), args.clients, args.requests)
+    print(f"{args.model} with {args.clients} clients, {args.requests} requests")
+    print(f"{'unbatched':<12}{unbatched:>8.1f} QPS")
+    print(f"{'batched':<12}{batched:>8.1f} QPS  ({batched / unbatched:.1f}x)")
+    sizes = get_encoder(args.model).stats()["batch_size"]
+    print(f"mean batch size: {sizes['mean']}")
+
+if __name__ == "__main__":
+    main()
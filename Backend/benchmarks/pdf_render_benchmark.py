@@ -0,0 +1,119 @@
+# pdf_render_benchmark.py
+#
+# Renders a sample complaint letter with every ipc_/bns_ template and reports
+# the render time per template (i.e. per pipeline and language), and the
+# resident memory of the render processes, which should hold WeasyPrint and
+# its fonts but none of the app's models.
+#
+#   cd Backend && python -m benchmarks.pdf_render_benchmark --runs 10
+
+import argparse
+import datetime
+import os
+import statistics
+import tempfile
+import time
+from mlModel import pdf_renderer
+from mlModel.pdf_renderer import precompile_templates, render_pdf
+
+SAMPLE_SECTION = {
+    "Name": "Theft",
+    "Description": "Whoever intends to take dishonestly any movable property out of the possession of any person without that person's consent.",
+    "Punishment": "Imprisonment of either description for a term which may extend to three years, or with fine, or with both.",
+    "Cognizability": "Cognizable",
+    "Bailability": "Non-Bailable",
+    "Offence_Category": "Offences against property",
+}
+
+def sample_context(template_name):
+    context = {
+        "Current_Date": datetime.date.today().strftime("%d-%m-%Y"),
+        "Police_Station_or_Department_Name": "Concerned Police Station",
+        "District_City": "Lucknow",
+        "Full_Name": "Test User",
+        "Age": "30",
+        "Full_Address": "Lucknow",
+        "User_Complaint_Summary": "My mobile phone was stolen from my bag at the bus stand yesterday evening. " * 4,
+        "Gender": "Male",
+        "Phone_Number": "9999999999",
+        "ID_Number": "NA",
+        "Email": "test@example.com",
+        "Signature_or_Thumb": "Signature",
+        "Village_District": "Lucknow",
+    }
+    if template_name.startswith("ipc_"):
+        context.update(
+            IPC_Section_Number="379",
+            IPC_Section_Name=SAMPLE_SECTION["Name"],
+            IPC_Section_Description=SAMPLE_SECTION["Description"],
+            Punishment=SAMPLE_SECTION["Punishment"],
+            Cognizability=SAMPLE_SECTION["Cognizability"],
+            Bailability=SAMPLE_SECTION["Bailability"],
+            Offence_Category=SAMPLE_SECTION["Offence_Category"],
+            Other_IPC_Sections=[{
+                "IPC_Section": "411",
+                "Name": "Dishonestly receiving stolen property",
+                "Description": SAMPLE_SECTION["Description"],
+                "Punishment": SAMPLE_SECTION["Punishment"],
+                "Cognizability": SAMPLE_SECTION["Cognizability"],
+                "Bailability": SAMPLE_SECTION["Bailability"],
+                "Category": SAMPLE_SECTION["Offence_Category"],
+            }],
+        )
+    else:
+        context["Sections"] = [
+            {
+                "bns_Section_Number": number,
+                "bns_Section_Name": SAMPLE_SECTION["Name"],
+                "bns_Section_Description": SAMPLE_SECTION["Description"],
+                "Punishment": SAMPLE_SECTION["Punishment"],
+                "Cognizability": SAMPLE_SECTION["Cognizability"],
+                "Bailability": SAMPLE_SECTION["Bailability"],
+                "Offence_Category": SAMPLE_SECTION["Offence_Category"],
+            }
+            for number in ("303", "317")
+        ]
+    return context
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def render_worker_rss():
+    """Resident set size of each PDF render process, read from /proc (Linux)."""
+    sizes = []
+    for pid in (pdf_renderer._pool._processes if pdf_renderer._pool else {}):
+        try:
+            with open(f"/proc/{pid}/statm") as f:
+                sizes.append(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE"))
+        except (OSError, ValueError, IndexError):
+            pass
+    return sizes
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark complaint PDF rendering per template")
+    parser.add_argument("--runs", type=int, default=5, help="timed renders per template")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed renders per template")
+    args = parser.parse_args()
+
+    templates = precompile_templates()
+    print(f"{'template':<36}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        for template_name in templates:
+            context = sample_context(template_name)
+            output_file = os.path.join(out_dir, template_name.replace(".html", ".pdf"))
+            for _ in range(args.warmup):
+                render_pdf(template_name, context, output_file)
+            samples = []
+            for _ in range(args.runs):
+                started = time.perf_counter()
+                render_pdf(template_name, context, output_file)
+                samples.append((time.perf_counter() - started) * 1000)
+            print(f"{template_name:<36}{statistics.mean(samples):>10.1f}"
+                  f"{percentile(samples, 50):>10.1f}{percentile(samples, 95):>10.1f}")
+    sizes = render_worker_rss()
+    if sizes:
+        print(f"render processes: {len(sizes)}, RSS {min(sizes) / 2**20:.0f}-{max(sizes) / 2**20:.0f} MiB each")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# scheme_eligibility_check.py
+#
+# Checks the vectorized eligibility mask in mlModel/schemes.py against the
+# original per-row rules (reference_is_eligible below, kept verbatim) on
+# random user profiles drawn from the catalog's own values, and reports the
+# mask's cost per profile. Re-run it whenever Schemes.csv changes.
+#
+#   cd Backend && python -m benchmarks.scheme_eligibility_check --profiles 300
+
+import argparse
+import random
+import sys
+import time
+import numpy as np  # type: ignore
+from mlModel.schemes import df, clean_income, eligible_mask
+
+def reference_is_eligible(row, user_profile):
+    """The row-by-row rules eligible_mask must reproduce."""
+    try:
+        if str(row['Min Age']).lower() not in ['none', 'any'] and int(user_profile['age']) < int(row['Min Age']):
+            return False
+        if str(row['Max Age']).lower() not in ['none', 'any'] and int(user_profile['age']) > int(row['Max Age']):
+            return False
+    except:
+        pass
+
+    if row['Gender'] != 'any' and row['Gender'] != user_profile['gender'].lower():
+        return False
+    if row['Caste'] != 'any' and row['Caste'] != user_profile['caste'].lower():
+        return False
+
+    scheme_income = clean_income(row['Income Max (Annual)'])
+    if scheme_income is not None and user_profile['income'] > scheme_income:
+        return False
+
+    if row['Occupation'] != 'any' and row['Occupation'] != 'none':
+        user_occupations = user_profile['occupation']
+        if isinstance(user_occupations, list):
+            if not any(occ.lower() in row['Occupation'] for occ in user_occupations):
+                return False
+        else:
+            if user_occupations.lower() not in row['Occupation']:
+                return False
+
+    if row['state'] not in ['any', 'central']:
+        if row['state'] != user_profile['state'].lower():
+            return False
+
+    return True
+
+def random_profile(rng):
+    """A profile mixing catalog values (so schemes match) with off-catalog ones and edge cases."""
+    occupations = [occ for occ in df['Occupation'].unique() if occ not in ('any', 'none')] + ['weaver']
+    caps = [cap for cap in map(clean_income, df['Income Max (Annual)'].unique()) if cap is not None]
+    occupation = rng.choice(occupations).split()[0]
+    return {
+        'gender': rng.choice(['Female', 'male', 'other']),
+        'caste': rng.choice(['SC', 'st', 'obc', 'general']),
+        'income': rng.choice([0, *rng.sample(caps, min(3, len(caps))), 10 ** 7]),
+        'occupation': occupation if rng.random() < 0.5 else rng.sample(occupations, rng.randint(0, 3)),
+        'state': rng.choice([*df['state'].unique(), 'Gujarat', 'kerala']),
+        'age': rng.choice([0, 5, 17, 18, 19, 30, 60, 61, 90, '25', 'unknown']),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Check eligible_mask against the per-row eligibility rules")
+    parser.add_argument("--profiles", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rows = [df.iloc[i] for i in range(len(df))]
+    mismatches = 0
+    mask_seconds = 0.0
+    for _ in range(args.profiles):
+        profile = random_profile(rng)
+        started = time.perf_counter()
+        mask = eligible_mask(profile)
+        mask_seconds += time.perf_counter() - started
+        expected = np.array([reference_is_eligible(row, profile) for row in rows])
+        differing = np.flatnonzero(mask != expected)
+        if len(differing):
+            mismatches += 1
+            print(f"❌ {profile}: rows {differing[:10].tolist()} differ")
+
+    print(f"{args.profiles} profiles over {len(df)} schemes, {mismatches} mismatching")
+    print(f"eligible_mask: {mask_seconds / args.profiles * 1000:.3f} ms per profile")
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,109 @@
 import datetime
+import os
 
 class Config:
     SQLALCHEMY_DATABASE_URI = 'sqlite:///users.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = 'super-secret-key'  # Change this in production
     JWT_ACCESS_TOKEN_EXPIRES = datetime.timedelta(days=1)
+
+    # ML models (loaded once per process by mlModel/model_registry.py)
+    WHISPER_MODEL_SIZE = 'medium'
+    MULTILINGUAL_ENCODER = 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2'
+    QUERY_ENCODER = 'all-MiniLM-L6-v2'
+    SCHEME_ENCODER = 'BAAI/bge-base-en-v1.5'
+    # Models are loaded on first use. Over this budget of unshared memory, idle models (unused for
+    # MODEL_IDLE_SECONDS) are unloaded least recently used first and reloaded when needed again (0 disables).
+    # Models preloaded by the pre-fork master are shared with the workers and never unloaded
+    MODEL_MEMORY_BUDGET_BYTES = 0
+    MODEL_IDLE_SECONDS = 600
+    # Models warmup/preload load and /readyz requires; 'asr' is the configured ASR backend's model.
+    # A schemes-only deployment sets ('scheme_encoder',) and never loads the speech models
+    SERVED_MODELS = ('asr', 'query_encoder', 'scheme_encoder')
+
+    # Precomputed embedding matrices (built by `python -m mlModel.embedding_index`)
+    EMBEDDING_INDEX_DIR = os.path.join(os.path.dirname(__file__), 'mlModel', 'index_cache')
+
+    # Translation cache (in-memory LRU in front of a shared SQLite file)
+    TRANSLATION_CACHE_PATH = os.path.join(os.path.dirname(__file__), 'translation_cache.db')
+    TRANSLATION_CACHE_MEMORY_ITEMS = 4096
+    TRANSLATION_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+    # Translation backends: 'google' (remote) or 'indictrans2' (local CPU model).
+    # The fallback handles strings the primary fails on; set it to None to disable.
+    TRANSLATION_BACKEND = 'google'
+    TRANSLATION_FALLBACK_BACKEND = 'indictrans2'
+    TRANSLATION_MAX_WORKERS = 8  # concurrent remote translation calls per worker
+    TRANSLATION_REMOTE_TIMEOUT = 10  # seconds to wait for one remote batch
+    TRANSLATION_REMOTE_COOLDOWN = 30  # seconds to skip the remote backend after it fails
+    INDICTRANS_BATCH_SIZE = 16
+
+    # Pre-translated section texts (built by `python -m mlModel.section_catalog`)
+    SECTION_CATALOG_DIR = os.path.join(os.path.dirname(__file__), 'mlModel', 'data', 'catalog')
+
+    # Background complaint jobs (/api/jobs/...)
+    JOBS_DB_PATH = os.path.join(os.path.dirname(__file__), 'jobs.db')
+    JOB_WORKERS = 2  # pipelines running at once per worker process
+    JOB_QUEUE_DEPTH = 16  # queued + running jobs before submissions get 503
+    JOB_STREAM_MAX_SECONDS = 300  # an SSE stream is closed after this; EventSource reconnects with Last-Event-ID
+    JOB_STREAM_POLL_MIN_SECONDS = 0.25  # SSE polling of a job run by another worker, backing off
+    JOB_STREAM_POLL_MAX_SECONDS = 2  # to this while the job records no events
+
+    # Artifact phase (TTS + complaint PDFs) runs its independent stages concurrently
+    ARTIFACT_WORKERS = 6
+
+    # WeasyPrint layout runs in its own process pool (0 renders in the request thread)
+    PDF_RENDER_WORKERS = 2
+
+    # Deferred artifacts: only the rendering inputs are stored; files are built on first download
+    DEFER_ARTIFACTS = False
+    ARTIFACTS_DB_PATH = os.path.join(os.path.dirname(__file__), 'artifacts.db')
+    ARTIFACT_RENDER_TIMEOUT = 120
+
+    # Content-addressed artifact store: identical narrations/letters are rendered once and linked
+    ARTIFACT_CAS_DIR = os.path.join(os.path.dirname(__file__), 'artifact_cache')
+    ARTIFACT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+    # Opt-in expiry of users' complaint files in /static, in seconds; 0 (default) keeps them forever
+    # and garbage collection only reclaims blobs no complaint file references any more
+    ARTIFACT_REF_TTL = 0
+    ARTIFACT_GC_GRACE = 600  # blobs used more recently than this are never evicted
+
+    # Text-to-speech: 'gtts' (remote), 'espeak' (local, offline) or 'silent' (tests)
+    TTS_BACKEND = 'gtts'
+    TTS_MAX_WORKERS = 4  # segments synthesized in parallel per worker
+
+    # Run a synthetic request through every model at startup; /readyz waits for it
+    WARMUP_ON_STARTUP = True
+
+    # Speech recognition: 'whisper' (openai-whisper) or 'faster-whisper' (CTranslate2, if installed).
+    # WHISPER_MODEL_SIZE applies to both; compare options with python -m benchmarks.asr_benchmark
+    ASR_BACKEND = 'whisper'
+    ASR_QUANTIZE = None  # 'int8': dynamic int8 quantization of the Linear layers / CTranslate2 int8
+    ASR_THREADS = 0  # CTranslate2 threads of faster-whisper (0 keeps its default); torch uses WORKER_TORCH_THREADS
+    # Concurrent requests of up to 30 s are micro-batched through the Whisper encoder (1 disables)
+    ASR_BATCH_MAX_SIZE = 8
+    ASR_BATCH_MAX_WAIT_MS = 20
+    # Concurrent query embeddings (sections, schemes) are coalesced per encoder model (1 disables)
+    ENCODER_BATCH_MAX_SIZE = 32
+    ENCODER_BATCH_MAX_WAIT_MS = 5
+
+    # Long recordings are cut at silences and the chunks batched through Whisper together (0 seconds disables)
+    ASR_LONG_AUDIO_SECONDS = 60
+    ASR_CHUNK_SECONDS = 28  # plus the overlap on both sides stays within one 30 s Whisper window
+    ASR_CHUNK_OVERLAP_SECONDS = 1
+
+    # Upload ingestion: decoded in memory to 16 kHz mono, longer/larger uploads are rejected (413)
+    AUDIO_MAX_BYTES = 25 * 1024 * 1024
+    AUDIO_MAX_SECONDS = 600
+    AUDIO_SILENCE_THRESHOLD_DB = -35  # leading/trailing frames this far below the loudest one are trimmed
+    MAX_CONTENT_LENGTH = AUDIO_MAX_BYTES + 1024 * 1024  # Flask refuses bigger request bodies outright
+
+    # Pre-fork serving (gunicorn -c gunicorn.conf.py wsgi:app); size it with python -m benchmarks.capacity_probe
+    PREFORK = False  # set by gunicorn.conf.py: background threads start in the workers, not the master
+    SERVER_BIND = '0.0.0.0:5000'
+    SERVER_WORKERS = 2
+    SERVER_THREADS = 8  # request threads per worker; concurrent requests are what the micro-batchers coalesce
+    SERVER_TIMEOUT = 300  # long recordings can take minutes
+    WORKER_TORCH_THREADS = 0  # intra-op threads per worker (0 splits the cores evenly between the workers)
+    WORKER_MAX_REQUESTS = 2000  # recycle a worker after this many requests (0 disables)
+    WORKER_MAX_PRIVATE_BYTES = 3 * 1024 * 1024 * 1024  # recycle once a worker's unshared memory exceeds this
@@ -0,0 +1,62 @@
+# gunicorn.conf.py
+#
+# Pre-fork server for production:
+#
+#   cd Backend && gunicorn -c gunicorn.conf.py wsgi:app
+#
+# The master loads the app and every model before forking (see serving.py),
+# so the workers share one copy of the weights. Pick SERVER_WORKERS,
+# SERVER_THREADS, WORKER_TORCH_THREADS and WORKER_MAX_PRIVATE_BYTES in
+# Config from the output of `python -m benchmarks.capacity_probe` on the
+# target machine: it measures the shared model memory, the per-worker
+# overhead and the single-worker throughput, and prints the settings.
+
+import os
+import sys
+
+# gunicorn reads this file before it puts the working directory on sys.path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config  # noqa: E402
+import serving  # noqa: E402
+
+# Background threads (job queue, warmup) are started per worker in post_fork, not in the master
+Config.PREFORK = True
+
+bind = Config.SERVER_BIND
+workers = Config.SERVER_WORKERS
+worker_class = "gthread"
+threads = Config.SERVER_THREADS
+timeout = Config.SERVER_TIMEOUT
+# A recycled worker gets as long to finish its requests and jobs as a request may take
+graceful_timeout = Config.SERVER_TIMEOUT
+preload_app = True
+max_requests = Config.WORKER_MAX_REQUESTS
+# Spread the recycling out so the workers do not all restart at once
+max_requests_jitter = Config.WORKER_MAX_REQUESTS // 10
+
+
+def when_ready(server):
+    # Runs in the master after the app is imported and before the first worker is forked
+    serving.preload()
+
+
+def post_fork(server, worker):
+    serving.after_fork()
+    worker.log.info(f"Worker {worker.pid} ready with {serving.torch_threads_per_worker()} torch threads")
+
+
+def post_request(worker, req, environ, resp):
+    if serving.should_recycle():
+        worker.log.info(f"Recycling worker {worker.pid}: unshared memory above {Config.WORKER_MAX_PRIVATE_BYTES} bytes")
+        # The same graceful exit gunicorn uses for max_requests
+        worker.alive = False
+
+
+def child_exit(server, worker):
+    # Runs in the master. Jobs the worker was still running would otherwise stay 'running' until
+    # some later worker starts; queue them again now (the replacement worker resumes them)
+    from utils.job_queue import job_queue
+    job_ids = job_queue.requeue_runner(worker.pid)
+    if job_ids:
+        server.log.info(f"Re-queued {len(job_ids)} jobs of exited worker {worker.pid}")
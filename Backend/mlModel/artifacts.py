@@ -0,0 +1,369 @@
+# artifacts.py
+#
+# Complaint artifacts (the MP3 narration and the complaint PDFs).
+#
+# Every artifact is content-addressed: the normalized rendering inputs, the
+# engine and the kind are hashed, the rendered file is kept once under
+# Config.ARTIFACT_CAS_DIR and each complaint's /static file is a hard link
+# (or copy) of it. Two users who match the same sections in the same
+# language therefore share one narration instead of calling gTTS again.
+# Blobs are reference counted; garbage collection expires old complaint
+# files and evicts unreferenced blobs, least recently used first, once the
+# cache is over its byte budget.
+#
+# With Config.DEFER_ARTIFACTS the pipeline only records the rendering inputs
+# and returns the URL; the file is rendered on its first download. Concurrent
+# first downloads are coalesced so every file is built once: threads of one
+# process wait on a per-file lock, and other processes wait on the row they
+# could not claim.
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import unicodedata
+from config import Config
+
+# ----------------------------
+# Renderers: fn(output_file, **inputs) -> output_file
+# ----------------------------
+RENDERERS = {}
+
+def renderer(kind, engine):
+    """`engine` is part of the content key, so changing it never serves stale output."""
+    def register(fn):
+        RENDERERS[kind] = (engine, fn)
+        return fn
+    return register
+
+@renderer("pdf", engine="weasyprint")
+def _render_pdf(output_file, template_name, context):
+    from mlModel.pdf_renderer import render_pdf
+    return render_pdf(template_name, context, output_file)
+
+@renderer("tts", engine="segments")
+def _render_tts(output_file, segments, lang, backend):
+    from mlModel.tts_backends import synthesize_segments
+    return synthesize_segments(segments, lang, output_file, backend=backend)
+
+def _normalize(value):
+    if isinstance(value, str):
+        return unicodedata.normalize("NFC", value).strip()
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+def content_key(kind, engine, inputs):
+    payload = json.dumps([kind, engine, inputs], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _link(blob, output_file):
+    try:
+        os.link(blob, output_file)
+    except OSError:
+        # Different filesystem, or links unsupported
+        shutil.copyfile(blob, output_file)
+
+# ----------------------------
+# Store
+# ----------------------------
+class ArtifactStore:
+    def __init__(self, db_path, cas_dir, render_timeout=120, ref_ttl=None, max_cache_bytes=512 * 1024 * 1024,
+                 gc_grace=600):
+        self.db_path = db_path
+        self.cas_dir = cas_dir
+        self.render_timeout = render_timeout
+        self.ref_ttl = ref_ttl
+        self.max_cache_bytes = max_cache_bytes
+        self.gc_grace = gc_grace
+        # Striped so the lock tables stay bounded however many files are served. They only order
+        # threads of this process; across worker processes blobs are claimed in SQLite (_touch_blob).
+        # File locks are always taken before blob locks.
+        self._file_locks = [threading.Lock() for _ in range(64)]
+        self._blob_locks = [threading.Lock() for _ in range(64)]
+        # Blobs built while another blob is being rendered (e.g. TTS segments of a narration)
+        self._part_locks = [threading.Lock() for _ in range(64)]
+        self._renders_since_gc = 0
+        self._local = threading.local()
+        self.counters = {"hits": 0, "misses": 0, "expired_refs": 0, "evictions": 0}
+        os.makedirs(cas_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS artifacts ("
+                " filename TEXT PRIMARY KEY, kind TEXT, inputs TEXT, output_file TEXT,"
+                " status TEXT, claimed_at REAL, created_at REAL, rendered_at REAL, error TEXT)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS blobs ("
+                " digest TEXT PRIMARY KEY, kind TEXT, path TEXT, size INTEGER, refs INTEGER,"
+                " created_at REAL, last_used REAL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS refs ("
+                " filename TEXT PRIMARY KEY, digest TEXT, output_file TEXT, created_at REAL)"
+            )
+
+    def _connect(self):
+        # One connection per thread and per process (connections must not cross a fork); in WAL mode
+        # the lookups and claim polls of other workers do not wait on a render's write transaction
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _file_lock(self, filename):
+        return self._file_locks[hash(filename) % len(self._file_locks)]
+
+    def _blob_lock(self, digest, locks=None):
+        locks = locks or self._blob_locks
+        return locks[hash(digest) % len(locks)]
+
+    def _blob_for(self, kind, engine, ext, inputs):
+        digest = content_key(kind, engine, inputs)
+        return digest, os.path.join(self.cas_dir, digest[:2], digest + ext)
+
+    # ----------------------------
+    # Rendering
+    # ----------------------------
+    def _touch_blob(self, digest):
+        """
+        Claims a stored blob before its file is used: bumping last_used keeps
+        the garbage collector of every process off it for gc_grace seconds.
+        False when there is no such blob (never stored, or just evicted).
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            return conn.execute("UPDATE blobs SET last_used = ? WHERE digest = ?", (time.time(), digest)).rowcount > 0
+
+    def _store_blob(self, kind, digest, blob, render, inputs, force=False):
+        """Renders the blob on a miss and marks it used; the caller holds its blob lock."""
+        if not force and self._touch_blob(digest) and os.path.exists(blob):
+            self.counters["hits"] += 1
+        else:
+            self.counters["misses"] += 1
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            base, ext = os.path.splitext(blob)
+            tmp_file = f"{base}.{os.getpid()}.{threading.get_ident()}.tmp{ext}"
+            try:
+                render(tmp_file, **inputs)
+                os.replace(tmp_file, blob)
+            finally:
+                if os.path.exists(tmp_file):
+                    os.remove(tmp_file)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO blobs (digest, kind, path, size, refs, created_at, last_used) VALUES (?, ?, ?, ?, 0, ?, ?)"
+                " ON CONFLICT(digest) DO UPDATE SET last_used = excluded.last_used",
+                (digest, kind, blob, os.path.getsize(blob), now, now)
+            )
+
+    def _maybe_collect(self):
+        self._renders_since_gc += 1
+        if self._renders_since_gc >= 100:
+            self._renders_since_gc = 0
+            self.collect_garbage()
+
+    def _render(self, kind, output_file, inputs):
+        """Links output_file to the blob for these inputs, rendering the blob on a miss."""
+        engine, render = RENDERERS[kind]
+        inputs = _normalize(inputs)
+        digest, blob = self._blob_for(kind, engine, os.path.splitext(output_file)[1], inputs)
+        with self._blob_lock(digest):
+            self._store_blob(kind, digest, blob, render, inputs)
+            try:
+                _link(blob, output_file)
+            except FileNotFoundError:
+                # Removed by another process after all (e.g. by hand); render it again
+                self._store_blob(kind, digest, blob, render, inputs, force=True)
+                _link(blob, output_file)
+            self._add_ref(digest, output_file)
+        self._maybe_collect()
+        return output_file
+
+    def cached(self, kind, engine, ext, render, **inputs):
+        """
+        Path of the stored blob for these inputs, built with render(output_file,
+        **inputs) on a miss. No complaint file references it, so once it goes
+        cold the garbage collector may evict it.
+        """
+        inputs = _normalize(inputs)
+        digest, blob = self._blob_for(kind, engine, ext, inputs)
+        with self._blob_lock(digest, self._part_locks):
+            self._store_blob(kind, digest, blob, render, inputs)
+        # No collection here: this may run inside another blob's render, which holds its lock
+        return blob
+
+    def _add_ref(self, digest, output_file):
+        with self._connect() as conn:
+            added = conn.execute(
+                "INSERT OR IGNORE INTO refs (filename, digest, output_file, created_at) VALUES (?, ?, ?, ?)",
+                (os.path.basename(output_file), digest, os.path.abspath(output_file), time.time())
+            ).rowcount
+            if added:
+                conn.execute("UPDATE blobs SET refs = refs + 1 WHERE digest = ?", (digest,))
+
+    def produce(self, kind, output_file, **inputs):
+        """Renders the artifact now, or records its inputs when deferred; returns output_file."""
+        engine = RENDERERS[kind][0]
+        ext = os.path.splitext(output_file)[1]
+        if not Config.DEFER_ARTIFACTS or os.path.exists(self._blob_for(kind, engine, ext, _normalize(inputs))[1]):
+            # Eager mode, or the blob is already stored and linking it costs nothing
+            return self._render(kind, output_file, inputs)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO artifacts (filename, kind, inputs, output_file, status, created_at)"
+                " VALUES (?, ?, ?, ?, 'pending', ?)",
+                (os.path.basename(output_file), kind, json.dumps(inputs), os.path.abspath(output_file), time.time())
+            )
+        return output_file
+
+    # ----------------------------
+    # Deferred artifacts
+    # ----------------------------
+    def _claim(self, filename):
+        # Only one process renders a file; a claim older than render_timeout is presumed dead
+        now = time.time()
+        with self._connect() as conn:
+            claimed = conn.execute(
+                "UPDATE artifacts SET status = 'rendering', claimed_at = ?"
+                " WHERE filename = ? AND (status IN ('pending', 'ready', 'failed')"
+                " OR (status = 'rendering' AND claimed_at < ?))",
+                (now, filename, now - self.render_timeout)
+            ).rowcount
+            row = conn.execute("SELECT * FROM artifacts WHERE filename = ?", (filename,)).fetchone()
+        return row, bool(claimed)
+
+    def _finish(self, filename, status, error=None):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE artifacts SET status = ?, rendered_at = ?, error = ? WHERE filename = ?",
+                (status, time.time(), error, filename)
+            )
+
+    def materialize(self, filename):
+        """
+        Makes sure a deferred artifact exists on disk and returns its path, or
+        None if `filename` was never deferred. Raises if rendering fails.
+        """
+        with self._file_lock(filename):
+            deadline = time.monotonic() + self.render_timeout
+            poll_interval = 0.1
+            while True:
+                row, claimed = self._claim(filename)
+                if row is None:
+                    return None
+                if os.path.exists(row["output_file"]):
+                    if claimed:
+                        self._finish(filename, "ready")
+                    return row["output_file"]
+                if claimed:
+                    break
+                # Another process is rendering it
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Timed out waiting for {filename} to be rendered")
+                time.sleep(poll_interval)
+                poll_interval = min(poll_interval * 2, 1.0)
+
+            try:
+                self._render(row["kind"], row["output_file"], json.loads(row["inputs"]))
+            except Exception as e:
+                self._finish(filename, "failed", str(e))
+                raise
+            self._finish(filename, "ready")
+            print(f"✅ Rendered deferred artifact {filename}")
+            return row["output_file"]
+
+    # ----------------------------
+    # Garbage collection
+    # ----------------------------
+    def collect_garbage(self):
+        """
+        If ref_ttl is set (opt-in), expire complaint files older than it (dropping their references),
+        then evict unreferenced blobs, least recently used first, until the
+        store fits max_cache_bytes. Referenced blobs and blobs used within the
+        last gc_grace seconds (possibly being linked by another process) are
+        never evicted.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            if self.ref_ttl:
+                expired = conn.execute(
+                    "SELECT filename, digest, output_file FROM refs WHERE created_at < ?", (now - self.ref_ttl,)
+                ).fetchall()
+                for ref in expired:
+                    if os.path.exists(ref["output_file"]):
+                        os.remove(ref["output_file"])
+                    conn.execute("DELETE FROM refs WHERE filename = ?", (ref["filename"],))
+                    conn.execute("UPDATE blobs SET refs = refs - 1 WHERE digest = ?", (ref["digest"],))
+                conn.execute("DELETE FROM artifacts WHERE created_at < ?", (now - self.ref_ttl,))
+                self.counters["expired_refs"] += len(expired)
+
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+            if total <= self.max_cache_bytes:
+                return
+            candidates = conn.execute(
+                "SELECT digest, kind, path, size FROM blobs WHERE refs <= 0 AND last_used < ? ORDER BY last_used",
+                (now - self.gc_grace,)
+            ).fetchall()
+
+        # Trim to 90% so we do not collect again on the very next render
+        excess = total - int(self.max_cache_bytes * 0.9)
+        freed = 0
+        for blob in candidates:
+            if freed >= excess:
+                break
+            locks = self._blob_locks if blob["kind"] in RENDERERS else self._part_locks
+            with self._blob_lock(blob["digest"], locks):
+                # Re-check in a write transaction: another process may have claimed or linked it meanwhile.
+                # The file goes before the commit, so a claim either sees the row with its file or neither.
+                with self._connect() as conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    evicted = conn.execute(
+                        "DELETE FROM blobs WHERE digest = ? AND refs <= 0 AND last_used < ?",
+                        (blob["digest"], now - self.gc_grace)
+                    ).rowcount
+                    if evicted and os.path.exists(blob["path"]):
+                        os.remove(blob["path"])
+            if evicted:
+                freed += blob["size"]
+                self.counters["evictions"] += 1
+
+    def stats(self):
+        with self._connect() as conn:
+            blobs = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(refs > 0), 0) FROM blobs"
+            ).fetchone()
+            refs = conn.execute("SELECT COUNT(*) FROM refs").fetchone()[0]
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_rate": round(self.counters["hits"] / lookups, 4) if lookups else None,
+            "blobs": blobs[0],
+            "blob_bytes": blobs[1],
+            "referenced_blobs": blobs[2],
+            "refs": refs,
+        }
+
+
+artifact_store = ArtifactStore(
+    Config.ARTIFACTS_DB_PATH,
+    Config.ARTIFACT_CAS_DIR,
+    render_timeout=Config.ARTIFACT_RENDER_TIMEOUT,
+    ref_ttl=Config.ARTIFACT_REF_TTL,
+    max_cache_bytes=Config.ARTIFACT_CACHE_MAX_BYTES,
+    gc_grace=Config.ARTIFACT_GC_GRACE,
+)
+
+if __name__ == "__main__":
+    # python -m mlModel.artifacts  -> run a garbage collection pass and print the store's stats
+    artifact_store.collect_garbage()
+    print(json.dumps(artifact_store.stats(), indent=2))
@@ -0,0 +1,169 @@
+# asr_backends.py
+#
+# Speech recognition engines behind transcribe_audio. Every backend takes an
+# audio path (or a 16 kHz mono float32 array) and returns {"text", "language"}
+# with the speech translated to English, as the classifiers expect. The
+# engine, model size, int8 quantization and thread count are chosen in
+# Config; the models themselves live in the model registry.
+
+from abc import ABC, abstractmethod
+from config import Config
+from mlModel.model_registry import get_model
+from mlModel.batching import MicroBatcher
+from mlModel.section_catalog import SUPPORTED_LANGUAGES
+
+# ----------------------------
+# Decoding profiles (the per-request `quality` field)
+# ----------------------------
+# Whisper's own fallback chain: re-decode at a higher temperature when the output looks degenerate
+TEMPERATURE_FALLBACK = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+
+DECODING_PROFILES = {
+    # Greedy, no fallback, no timestamp tokens, windows decoded independently
+    "fast": {"beam_size": 1, "temperature": 0.0, "condition_on_previous_text": False, "without_timestamps": True},
+    # openai-whisper's defaults
+    "balanced": {"beam_size": 1, "temperature": TEMPERATURE_FALLBACK, "condition_on_previous_text": True},
+    "accurate": {"beam_size": 5, "best_of": 5, "temperature": TEMPERATURE_FALLBACK, "condition_on_previous_text": True},
+}
+DEFAULT_PROFILE = "balanced"
+
+
+def parse_asr_options(quality=None, language=None):
+    """Validate the request's quality/language fields; raises ValueError on unknown values."""
+    quality = (quality or DEFAULT_PROFILE).strip().lower()
+    if quality not in DECODING_PROFILES:
+        raise ValueError(f"Unknown quality '{quality}', expected one of {', '.join(DECODING_PROFILES)}")
+    language = (language or "").strip().lower() or None
+    if language is not None and language not in SUPPORTED_LANGUAGES:
+        raise ValueError(f"Unsupported language hint '{language}', expected one of {', '.join(SUPPORTED_LANGUAGES)}")
+    return {"quality": quality, "language": language}
+
+class ASRBackend(ABC):
+    name = None
+    model_name = None
+
+    @abstractmethod
+    def transcribe(self, audio, task="translate", profile=DEFAULT_PROFILE, language=None):
+        """`language` skips language detection when given."""
+
+# ----------------------------
+# openai-whisper (PyTorch), optionally int8 dynamically quantized
+# ----------------------------
+# One Whisper window; shorter in-memory requests are micro-batched
+WHISPER_WINDOW_SAMPLES = 30 * 16000
+
+def _decode_with_fallback(model, features, task, profile, language):
+    """Batched whisper.decode over encoded windows with transcribe()'s temperature fallback per item."""
+    import whisper  # type: ignore
+    options = DECODING_PROFILES[profile]
+    temperature = options["temperature"]
+    temperatures = temperature if isinstance(temperature, tuple) else (temperature,)
+    results = [None] * len(features)
+    pending = list(range(len(features)))
+    for t in temperatures:
+        decoded = whisper.decode(model, features[pending], whisper.DecodingOptions(
+            task=task, language=language, temperature=t, fp16=False,
+            without_timestamps=options.get("without_timestamps", False),
+            # As in transcribe(): beam search only when greedy, best_of only when sampling
+            beam_size=options["beam_size"] if t == 0 and options["beam_size"] > 1 else None,
+            best_of=options.get("best_of") if t > 0 else None,
+        ))
+        retry = []
+        for i, result in zip(pending, decoded):
+            results[i] = result
+            silent = result.no_speech_prob > 0.6 and result.avg_logprob < -1.0
+            if not silent and (result.compression_ratio > 2.4 or result.avg_logprob < -1.0):
+                retry.append(i)
+        pending = retry
+        if not pending:
+            break
+    return [
+        {"text": "" if result.no_speech_prob > 0.6 and result.avg_logprob < -1.0 else result.text.strip(),
+         "language": result.language}
+        for result in results
+    ]
+
+def _transcribe_whisper_batch(items):
+    """items: (audio, task, profile, language). Encodes all windows at once, then decodes per option set."""
+    import torch  # type: ignore
+    import whisper  # type: ignore
+    model = get_model("whisper")
+    mels = torch.stack([
+        whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), n_mels=model.dims.n_mels)
+        for audio, _, _, _ in items
+    ]).to(model.device)
+    with torch.no_grad():
+        # whisper.decode skips the encoder when given (n_audio_ctx, n_audio_state) features
+        features = model.embed_audio(mels)
+
+    groups = {}
+    for i, (_, task, profile, language) in enumerate(items):
+        groups.setdefault((task, profile, language), []).append(i)
+    results = [None] * len(items)
+    for (task, profile, language), indices in groups.items():
+        for i, result in zip(indices, _decode_with_fallback(model, features[indices], task, profile, language)):
+            results[i] = result
+    return results
+
+whisper_batcher = MicroBatcher(
+    "asr", _transcribe_whisper_batch,
+    max_batch_size=Config.ASR_BATCH_MAX_SIZE, max_wait_ms=Config.ASR_BATCH_MAX_WAIT_MS,
+)
+
+class WhisperBackend(ASRBackend):
+    name = "whisper"
+    model_name = "whisper"
+
+    def transcribe(self, audio, task="translate", profile=DEFAULT_PROFILE, language=None):
+        if Config.ASR_BATCH_MAX_SIZE > 1 and not isinstance(audio, str) and len(audio) <= WHISPER_WINDOW_SAMPLES:
+            return whisper_batcher.submit((audio, task, profile, language)).result()
+
+        options = dict(DECODING_PROFILES[profile])
+        if options["beam_size"] == 1:
+            # openai-whisper decodes greedily when no beam size is given
+            del options["beam_size"]
+        # fp16 is a GPU-only path; on CPU it only triggers a warning and a fallback
+        result = get_model(self.model_name).transcribe(audio, task=task, language=language, fp16=False, **options)
+        return {"text": result["text"], "language": result["language"]}
+
+# ----------------------------
+# faster-whisper (CTranslate2), used when it is installed
+# ----------------------------
+class FasterWhisperBackend(ASRBackend):
+    name = "faster-whisper"
+    model_name = "faster_whisper"
+
+    @staticmethod
+    def available():
+        try:
+            import faster_whisper  # type: ignore  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def transcribe(self, audio, task="translate", profile=DEFAULT_PROFILE, language=None):
+        options = dict(DECODING_PROFILES[profile])
+        options.setdefault("best_of", 1)
+        segments, info = get_model(self.model_name).transcribe(audio, task=task, language=language, **options)
+        # segments is a generator; decoding happens while it is consumed
+        return {"text": "".join(segment.text for segment in segments), "language": info.language}
+
+# ----------------------------
+# Selection
+# ----------------------------
+BACKENDS = {
+    WhisperBackend.name: WhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+_instances = {}
+
+def get_asr_backend(name=None):
+    """The configured backend; faster-whisper falls back to whisper if it is not installed."""
+    name = name or Config.ASR_BACKEND
+    if name not in _instances:
+        backend = BACKENDS[name]
+        if backend is FasterWhisperBackend and not FasterWhisperBackend.available():
+            print("⚠️ faster-whisper is not installed, using openai-whisper")
+            backend = WhisperBackend
+        _instances[name] = backend()
+    return _instances[name]
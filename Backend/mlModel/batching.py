@@ -0,0 +1,121 @@
+# batching.py
+#
+# Dynamic micro-batching for the shared models. Request threads submit one
+# item and get a Future back; a single dispatcher thread per batcher waits
+# for the first item, keeps collecting until the batch is full or the oldest
+# item has waited max_wait_ms, and hands the whole batch to one call of the
+# model. Under load this trades a few milliseconds of queueing for far
+# better throughput than every thread driving the model on its own, and only
+# the dispatcher thread ever uses the model's intra-op threads.
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+# ----------------------------
+# Histograms
+# ----------------------------
+class Histogram:
+    """Cumulative bucket counts (Prometheus style) plus count and sum."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self._counts[i] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "buckets": {str(bound): count for bound, count in zip(self.buckets, self._counts)},
+                "count": self.count,
+                "sum": round(self.sum, 3),
+                "mean": round(self.sum / self.count, 3) if self.count else None,
+            }
+
+WAIT_MS_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float("inf"))
+
+# ----------------------------
+# Micro-batcher
+# ----------------------------
+BATCHERS = {}
+
+class MicroBatcher:
+    def __init__(self, name, process_batch, max_batch_size=8, max_wait_ms=10):
+        """process_batch(items) -> results, one per item and in the same order."""
+        self.name = name
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.queue_wait_ms = Histogram(WAIT_MS_BUCKETS)
+        self.batch_size = Histogram(range(1, max_batch_size + 1))
+        self.batch_ms = Histogram(WAIT_MS_BUCKETS)
+        self._lock = threading.Lock()
+        self._pid = None
+        BATCHERS[name] = self
+
+    def _ensure_dispatcher(self):
+        # Threads do not survive fork, so a forked worker starts its own dispatcher
+        with self._lock:
+            if self._pid != os.getpid():
+                self._queue = queue.Queue()
+                self._pid = os.getpid()
+                threading.Thread(target=self._dispatch, name=f"batch-{self.name}", daemon=True).start()
+
+    def submit(self, item):
+        self._ensure_dispatcher()
+        future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = batch[0][2] + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            # Items that queued up while the previous batch ran are taken without waiting
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _dispatch(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            for _, _, enqueued in batch:
+                self.queue_wait_ms.observe((started - enqueued) * 1000)
+            self.batch_size.observe(len(batch))
+            try:
+                results = self.process_batch([item for item, _, _ in batch])
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future, _), result in zip(batch, results):
+                    future.set_result(result)
+            self.batch_ms.observe((time.perf_counter() - started) * 1000)
+
+    def stats(self):
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+            "batch_size": self.batch_size.snapshot(),
+            "batch_ms": self.batch_ms.snapshot(),
+        }
+
+def batcher_stats():
+    return {name: batcher.stats() for name, batcher in BATCHERS.items()}
@@ -1,81 +1,95 @@
 import os
+import time
 import uuid
 import pandas as pd  # type: ignore
-import whisper  # type: ignore
-import torch  # type: ignore
-from sentence_transformers import SentenceTransformer, util  # type: ignore
-from indictrans2 import IndicTranslator  # type: ignore
-from gtts import gTTS  # type: ignore
-from jinja2 import Environment, FileSystemLoader  # type: ignore
-from weasyprint import HTML  # type: ignore
-from deep_translator import GoogleTranslator   # type: ignore
 import datetime
 from langdetect import detect  # type: ignore
-import subprocess
 import smtplib
 from email.message import EmailMessage
-from flask import send_from_directory
-
-# ✅ Auto-install fonts for regional language PDF support
-def install_fonts():
-    noto_path = "/usr/share/fonts/truetype/noto"
-    if not os.path.exists(noto_path):
-        try:
-            subprocess.run(["apt-get", "update"], check=True)
-            subprocess.run([
-                "apt-get", "install", "fonts-noto", "fonts-noto-cjk", "fonts-lohit-*", "-y"
-            ], check=True)
-            print("✅ Fonts installed successfully.")
-        except Exception as e:
-            print(f"❌ Font installation failed: {e}")
-    else:
-        print("✅ Fonts already installed.")
-
-# Load Models
-whisper_model = whisper.load_model("medium")
-text_model = SentenceTransformer('sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2')
-sbert = SentenceTransformer('all-MiniLM-L6-v2')
-translator_indic = IndicTranslator()
+from config import Config
+from mlModel.model_registry import get_model
+from mlModel.encoders import encode
+from mlModel.asr_backends import get_asr_backend, DEFAULT_PROFILE
+from mlModel.long_audio import should_chunk, transcribe_long
+from mlModel.embedding_index import load_or_build, as_tensor, to_builtin
+from mlModel.section_index import SectionIndex
+from mlModel.translation_cache import CachedTranslator
+from mlModel.section_catalog import lookup_section, phrasebook
+from mlModel.localization import LocalizedResponse
+from mlModel.stages import Stage, run_stages
+from mlModel.artifacts import artifact_store
+from mlModel.pdf_renderer import provision_fonts
 
 # Load CSVs
 BASE_DIR = os.path.dirname(__file__)
 DATA_DIR = os.path.join(BASE_DIR, "data")
-
-df_queries = pd.read_csv(os.path.join(DATA_DIR, "BNS_Queries.csv"))
-df_sections = pd.read_csv(os.path.join(DATA_DIR, "BNS_Section.csv"))
-
-# Debug: Print columns of df_sections to confirm its structure
-print("Columns in df_sections:", df_sections.columns.tolist())
-print("Columns in df_queries:", df_queries.columns.tolist())
-
-
-# Correct the mapping for queries: 'BNS Section' is the column that holds the actual section number in BNS_Queries.csv
-# The header you provided was: BNS Section,Category,Query1,...
-query_columns = [f"Query{i}" for i in range(1, 11)]
-all_queries, bns_mapping = [], []
-for idx, row in df_queries.iterrows():
-    for col in query_columns:
-        if pd.notna(row[col]):
-            all_queries.append(row[col])
-            bns_mapping.append(row['BNS Section']) # Access 'BNS Section' from df_queries
-
-stored_embeddings = text_model.encode(all_queries, convert_to_tensor=True)
-query_embeddings = sbert.encode(all_queries, convert_to_tensor=True)
-
-def transcribe_audio(path):
-    result = whisper_model.transcribe(path, task="translate")
-    return result['text'], result['language']
+QUERIES_CSV = os.path.join(DATA_DIR, "BNS_Queries.csv")
+SECTIONS_CSV = os.path.join(DATA_DIR, "BNS_Section.csv")
+
+def build_bns_index():
+    df_queries = pd.read_csv(QUERIES_CSV)
+    df_sections = pd.read_csv(SECTIONS_CSV)
+    section_lookup = {
+        str(to_builtin(record['BNS Section'])): {k: to_builtin(v) for k, v in record.items()}
+        for record in df_sections.to_dict('records')
+    }
+    # 'BNS Section' is the column that holds the actual section number in BNS_Queries.csv
+    query_columns = [f"Query{i}" for i in range(1, 11)]
+    all_queries, bns_mapping = [], []
+    for idx, row in df_queries.iterrows():
+        for col in query_columns:
+            # Queries for sections missing from the section table could never be returned
+            if pd.notna(row[col]) and str(to_builtin(row['BNS Section'])) in section_lookup:
+                all_queries.append(row[col])
+                bns_mapping.append(to_builtin(row['BNS Section']))
+
+    arrays = {
+        # Models come from the registry at use time, so they are only loaded when an index is rebuilt
+        "query_embeddings": get_model("query_encoder").encode(all_queries, convert_to_numpy=True, normalize_embeddings=True),
+    }
+    meta = {
+        "bns_mapping": bns_mapping,
+        "section_lookup": section_lookup,
+    }
+    return arrays, meta
+
+# Embeddings are memory-mapped from disk and only re-encoded when the CSVs or encoders change
+index_arrays, index_meta = load_or_build(
+    "bns", [QUERIES_CSV, SECTIONS_CSV],
+    [Config.QUERY_ENCODER], build_bns_index, version="3"
+)
+query_embeddings = as_tensor(index_arrays["query_embeddings"])
+bns_mapping = index_meta["bns_mapping"]
+section_lookup = index_meta["section_lookup"]
+bns_index = SectionIndex(query_embeddings, bns_mapping, section_lookup)
+
+def transcribe_audio(audio, quality=DEFAULT_PROFILE, language=None):
+    """
+    `audio` is a file path or 16 kHz mono float32 samples (utils.audio_utils.ingest_audio).
+    Returns (text, language, asr_info); asr_info records the decoding profile and time.
+    """
+    backend = get_asr_backend()
+    started = time.perf_counter()
+    if should_chunk(audio):
+        # Long recordings are split at silences and the chunks transcribed in parallel
+        result = transcribe_long(audio, profile=quality, language=language)
+    else:
+        result = backend.transcribe(audio, task="translate", profile=quality, language=language)
+    asr_info = {
+        "backend": backend.name,
+        "profile": quality,
+        "language_hint": language,
+        "chunks": result.get("chunks", 1),
+        "decode_seconds": round(time.perf_counter() - started, 3),
+    }
+    return result['text'], result['language'], asr_info
 
 def classify_bns(text, top_k=3):
-    input_embedding = sbert.encode(text, convert_to_tensor=True)
-    cos_scores = util.pytorch_cos_sim(input_embedding, query_embeddings)[0]
-    top_indices = torch.topk(cos_scores, k=top_k).indices.tolist()
+    input_embedding = encode("query_encoder", text)
     top_sections = []
-    for idx in top_indices:
-        section = bns_mapping[idx]
-        info = df_sections[df_sections['BNS Section'] == section].iloc[0].to_dict()
+    for info, score in bns_index.top_k(input_embedding, k=top_k):
         top_sections.append({
-            "bns Section": section,
+            "bns Section": info['BNS Section'],
             "Description": info['Description'],
             "Punishment": info['Punishment'],
             "Cognizable/Non-Cognizable": info['Cognizable/Non-Cognizable'],
@@ -84,26 +98,22 @@ def classify_bns(text, top_k=3):
         })
     return top_sections
 
-def speak_text(text, original_lang, filename="bns_output.mp3"):
+def speak_text(segments, original_lang, filename="bns_output.mp3"):
     gtts_lang_map = {
         "hi": "hi", "en": "en", "gu": "gu",
         "ta": "ta", "bn": "bn", "pa": "pa"
     }
     lang_code = gtts_lang_map.get(original_lang, "en")
-    try:
-        tts = gTTS(text=text, lang=lang_code)
-        tts.save(filename)
-        return filename
-    except Exception as e:
-        print(f"Error speaking text: {e}")
-        return None
+    if isinstance(segments, str):
+        segments = [segments]
+    # Failures propagate so the audio stage reports them in stage_errors
+    return artifact_store.produce("tts", filename, segments=list(segments), lang=lang_code,
+                                  backend=Config.TTS_BACKEND)
 
 def create_letter_pdf(user_name, user_location, details, sections,  # <-- sections: list of dicts
                       gender="Male", age="30", phone="NA", id_number="NA", email="NA",
                       original_lang="en", output_file="bns_letter.pdf"):
     template_file = get_template_for_lang(original_lang)
-    env = Environment(loader=FileSystemLoader("templates"))
-    template = env.get_template(template_file)
 
     # Prepare a list of section dicts for the template
     sections_for_pdf = []
@@ -119,7 +129,7 @@ def create_letter_pdf(user_name, user_location, details, sections,  # <-- sectio
             "Offence_Category": section['Category'],
         })
 
-    html_out = template.render(
+    return artifact_store.produce("pdf", output_file, template_name=template_file, context=dict(
         Current_Date=datetime.date.today().strftime("%d-%m-%Y"),
         Police_Station_or_Department_Name="Concerned Police Station",
         District_City=user_location,
@@ -134,9 +144,7 @@ def create_letter_pdf(user_name, user_location, details, sections,  # <-- sectio
         Email=email,
         Signature_or_Thumb="Signature",
         Village_District=user_location,
-    )
-    HTML(string=html_out).write_pdf(output_file)
-    return output_file
+    ))
 
 def get_template_for_lang(original_lang):
     templates = {
@@ -150,6 +158,10 @@ def get_template_for_lang(original_lang):
     return templates.get(original_lang, "bns_complaint_template_en.html")
 
 def deep_translate_section(section, translator):
+    # Catalogued sections are read straight from the offline section catalog
+    localized = lookup_section("bns", section['bns Section'], translator.target)
+    if localized is not None:
+        return {key: localized.get(key, value) for key, value in section.items()}
     # ⭐ MODIFIED: Access 'Name' safely using .get() with fallback
     section_name_translated = translator.translate(section.get('Name', section.get('Description', 'N/A')))
     return {
@@ -163,7 +175,7 @@ def conditional_translate(text, target_lang):
             return text
         detected_lang = detect(text)
         if detected_lang != target_lang:
-            return GoogleTranslator(source='auto', target=target_lang).translate(text)
+            return CachedTranslator(source='auto', target=target_lang).translate(text)
         return text
     except:
         return text
@@ -188,17 +200,41 @@ def send_email_with_attachments(recipient, subject, body, attachments):
     except Exception as e:
         return False
 
-def process_audio_pipeline(audio_path, user_details, output_dir="static"):
-    # ✅ Install fonts before PDF generation
-    install_fonts()
+def _notify(on_progress, stage, progress, **data):
+    """Reports a pipeline milestone (and whatever it produced) to the caller."""
+    if on_progress:
+        on_progress(stage, progress, data)
 
-    text, original_lang = transcribe_audio(audio_path)
+def process_audio_pipeline(audio, user_details, output_dir="static", on_progress=None,
+                           quality=DEFAULT_PROFILE, language=None):
+    text, original_lang, asr_info = transcribe_audio(audio, quality=quality, language=language)
+    _notify(on_progress, "transcribed", 30, transcribed_text=text, language=original_lang, asr=asr_info)
 
     bns_sections = classify_bns(text)
+    _notify(on_progress, "classified", 40,
+            matched_sections=[section['bns Section'] for section in bns_sections], bns_sections=bns_sections)
     # main_section = bns_sections[0] if bns_sections else {} # Ensure main_section is not empty
     # other_sections = bns_sections[1:] if len(bns_sections) > 1 else []
 
-    translator = GoogleTranslator(source='auto', target=original_lang)
+    translator = CachedTranslator(source='auto', target=original_lang, phrasebook=phrasebook("bns", original_lang))
+
+    # ✅ Every string of the response is translated exactly once, in one batch
+    localized = LocalizedResponse("bns", bns_sections, text, translator)
+    t = localized.phrase
+
+    what_to_do = [
+        t('File complaint under this section'),
+        t('Register FIR at police station'),
+        t('Keep all evidence safe'),
+        t('Consult a lawyer')
+    ]
+    recommended_actions = [
+        t("File complaint at nearest police station"),
+        t("Keep all evidence safe"),
+        t("Get legal advice from a lawyer"),
+        t("Ensure your safety"),
+        t("Keep copy of FIR")
+    ]
 
     # ✅ Enhanced bns Section Information in Regional Language
     translated_sections = []
@@ -207,192 +243,172 @@ def process_audio_pipeline(audio_path, user_details, output_dir="static"):
 
     # Add header
     formatted_output.append("=" * 80)
-    formatted_output.append(f"🌐 {translator.translate('Your complaint matches the following bns sections')} ({original_lang.upper()})")
+    formatted_output.append(f"🌐 {t('Your complaint matches the following bns sections')} ({original_lang.upper()})")
     formatted_output.append("=" * 80)
 
-    for i, section in enumerate(bns_sections, 1):
+    for i, section in enumerate(localized.sections, 1):
         # Create detailed regional language explanation with prominent section numbers
         regional_explanation = {
             "section_number": i,
-            "bns_section": section['bns Section'],
-            "description": translator.translate(section['Description']),
-            "punishment": translator.translate(section['Punishment']),
-            "bailability": translator.translate(section['Bailable/Non-Bailable']),
-            "cognizable": translator.translate(section['Cognizable/Non-Cognizable']),
-            "category": translator.translate(section['Category']),
-            "what_to_do": [
-                translator.translate('File complaint under this section'),
-                translator.translate('Register FIR at police station'),
-                translator.translate('Keep all evidence safe'),
-                translator.translate('Consult a lawyer')
-            ]
+            "bns_section": section.section_id,
+            "description": section['Description'],
+            "punishment": section['Punishment'],
+            "bailability": section['Bailable/Non-Bailable'],
+            "cognizable": section['Cognizable/Non-Cognizable'],
+            "category": section['Category'],
+            "what_to_do": list(what_to_do)
         }
 
         # Create formatted text for frontend display
         formatted_section = f"""
-🔢 {translator.translate('Matched bns Section')} {i}: {section['bns Section']}
+🔢 {t('Matched bns Section')} {i}: {section.section_id}
 
-📝 {translator.translate('Description')}: {translator.translate(section['Description'])}
+📝 {t('Description')}: {section['Description']}
 
-⚖️ {translator.translate('Punishment')}: {translator.translate(section['Punishment'])}
+⚖️ {t('Punishment')}: {section['Punishment']}
 
-🧷 {translator.translate('Bailability')}: {translator.translate(section['Bailable/Non-Bailable'])}
+🧷 {t('Bailability')}: {section['Bailable/Non-Bailable']}
 
-🚓 {translator.translate('Cognizable')}: {translator.translate(section['Cognizable/Non-Cognizable'])}
+🚓 {t('Cognizable')}: {section['Cognizable/Non-Cognizable']}
 
-📂 {translator.translate('Category')}: {translator.translate(section['Category'])}
+📂 {t('Category')}: {section['Category']}
 
-🔍 {translator.translate('What to do')}:
-- {translator.translate('File complaint under this section')}
-- {translator.translate('Register FIR at police station')}
-- {translator.translate('Keep all evidence safe')}
-- {translator.translate('Consult a lawyer')}
+🔍 {t('What to do')}:
+- {what_to_do[0]}
+- {what_to_do[1]}
+- {what_to_do[2]}
+- {what_to_do[3]}
 """
         formatted_output.append(formatted_section)
         formatted_output.append("-" * 80)
 
-        # Create audio block for TTS
-        audio_block = (f"bns Section: {section['bns Section']}. "
-                      f"Description: {section['Description']}. "
-                      f"Punishment: {section['Punishment']}. "
-                      f"Bailable: {section['Bailable/Non-Bailable']}. "
-                      f"Cognizable: {section['Cognizable/Non-Cognizable']}. "
-                      f"Category: {section['Category']}.")
-
-        translated_audio_block = translator.translate(audio_block)
-        translated_sections.append(translated_audio_block)
+        translated_sections.append(section.audio_block)
         detailed_bns_info.append(regional_explanation)
 
-    # ✅ Generate comprehensive audio with all bns details in regional language
-    comprehensive_audio_text = f"""
-{translator.translate('According to your complaint, the following bns sections apply:')}
-
-{chr(10).join(translated_sections)}
+    _notify(on_progress, "localized", 55, translated_texts=translated_sections, detailed_bns_info=detailed_bns_info)
+
+    # ✅ Narration in regional language, one segment per block (header, each section, the action list).
+    # Segments are synthesized and cached separately, so only text not yet spoken in this language hits TTS
+    audio_segments = [
+        t('According to your complaint, the following bns sections apply:'),
+        *translated_sections,
+        f"""{t('Please take the following steps:')}
+1. {recommended_actions[0]}
+2. {recommended_actions[1]}
+3. {recommended_actions[2]}
+4. {recommended_actions[3]}
+5. {recommended_actions[4]}
+""",
+    ]
 
-{translator.translate('Please take the following steps:')}
-1. {translator.translate('File complaint at nearest police station')}
-2. {translator.translate('Keep all evidence safe')}
-3. {translator.translate('Get legal advice from a lawyer')}
-4. {translator.translate('Ensure your safety')}
-5. {translator.translate('Keep copy of FIR')}
-"""
+    # Adjust paths for URLs to be web-accessible
+    def get_web_url(file_path):
+        if file_path and file_path.startswith(output_dir + os.sep):
+            # Assumes output_dir is 'static/bns_outputs' or similar.
+            # This converts 'static/bns_outputs/file.mp3' to '/static/bns_outputs/file.mp3'
+            return "/" + file_path
+        return file_path
 
     os.makedirs(output_dir, exist_ok=True)
-    # Generate a unique filename for the audio output
-    audio_unique_id = str(uuid.uuid4())
-    audio_output_filename = f"bns_output_{audio_unique_id}.mp3"
-    audio_file_path_full = os.path.join(output_dir, audio_output_filename)
-
-    audio_file_url = speak_text(comprehensive_audio_text, original_lang, audio_file_path_full)
-
-    # ✅ Generate detailed PDFs with enhanced information
-    # Generate unique IDs for PDF filenames
-    pdf_en_unique_id = str(uuid.uuid4())
-    pdf_regional_unique_id = str(uuid.uuid4())
-
-    pdf_en_path = os.path.join(output_dir, f"bns_letter_english_{pdf_en_unique_id}.pdf")
-    pdf_regional_path = os.path.join(output_dir, f"bns_letter_regional_{pdf_regional_unique_id}.pdf")
-
-    pdf_en = create_letter_pdf(
-        conditional_translate(user_details['name'], 'en'),
-        conditional_translate(user_details['location'], 'en'),
-        text,
-        bns_sections,  # Pass the list of top 3 sections
-        user_details['gender'], user_details['age'],
-        user_details['phone'], user_details['id_number'], user_details['email'],
-        original_lang='en', output_file=pdf_en_path
-    )
-
-    pdf_regional = create_letter_pdf(
-        conditional_translate(user_details['name'], original_lang),
-        conditional_translate(user_details['location'], original_lang),
-        translator.translate(text),
-        [deep_translate_section(sec, translator) for sec in bns_sections],  # List of translated sections
-        user_details['gender'], user_details['age'],
-        user_details['phone'], user_details['id_number'], user_details['email'],
-        original_lang=original_lang, output_file=pdf_regional_path
-    )
-
-    # ⭐ MODIFIED: Fix deep_translate_section logic
-    # The deep_translate_section function was structured to translate all items.
-    # To avoid KeyError, it should use .get() for 'Name' specifically if 'Name' is not always present.
-    # I'll update it to be more robust, and ensure the section dictionary passed to it
-    # already has the 'Name' key (even if it's a fallback) from classify_bns.
-    # So deep_translate_section doesn't need to specifically handle 'Name' KeyError
-    # but rather ensures all string values are translated.
+
+    # ✅ Audio and both PDFs are independent of each other, so they are built concurrently.
+    # Generate unique filenames for the audio output and the PDFs
+    def build_audio():
+        audio_file_path_full = os.path.join(output_dir, f"bns_output_{uuid.uuid4()}.mp3")
+        return speak_text(audio_segments, original_lang, audio_file_path_full)
+
+    def build_pdf_english():
+        return create_letter_pdf(
+            conditional_translate(user_details['name'], 'en'),
+            conditional_translate(user_details['location'], 'en'),
+            text,
+            bns_sections,  # Pass the list of top 3 sections
+            user_details['gender'], user_details['age'],
+            user_details['phone'], user_details['id_number'], user_details['email'],
+            original_lang='en', output_file=os.path.join(output_dir, f"bns_letter_english_{uuid.uuid4()}.pdf")
+        )
+
+    def build_pdf_regional():
+        return create_letter_pdf(
+            conditional_translate(user_details['name'], original_lang),
+            conditional_translate(user_details['location'], original_lang),
+            localized.transcript,
+            [sec.translated_section() for sec in localized.sections],  # List of translated sections
+            user_details['gender'], user_details['age'],
+            user_details['phone'], user_details['id_number'], user_details['email'],
+            original_lang=original_lang, output_file=os.path.join(output_dir, f"bns_letter_regional_{uuid.uuid4()}.pdf")
+        )
+
+    artifact_events = {
+        "audio": ("audio_ready", 70, "audio_url"),
+        "pdf_english": ("pdf_english_ready", 85, "pdf_english_url"),
+        "pdf_regional": ("pdf_regional_ready", 95, "pdf_regional_url"),
+    }
+
+    def on_artifact_done(name, outcome):
+        stage, progress, url_key = artifact_events[name]
+        path = outcome["value"]
+        _notify(on_progress, stage, progress, **{url_key: get_web_url(path) if path else ''})
+
+    artifacts = run_stages([
+        Stage("audio", build_audio),
+        Stage("pdf_english", build_pdf_english),
+        Stage("pdf_regional", build_pdf_regional),
+    ], on_done=on_artifact_done)
+    audio_file_url = artifacts["audio"]["value"]
+    pdf_en = artifacts["pdf_english"]["value"]
+    pdf_regional = artifacts["pdf_regional"]["value"]
 
     # ✅ Create detailed bns summary in regional language
+    def summary_entry(section):
+        return {
+            "section_number": section.section_id,
+            "description": section['Description'],
+            "punishment": section['Punishment'],
+            "bailability": section['Bailable/Non-Bailable'],
+            "cognizable": section['Cognizable/Non-Cognizable'],
+            "category": section['Category']
+        }
+
     bns_summary = {
         "total_sections_found": len(bns_sections),
-        "main_section": {
-            "section_number": bns_sections[0]['bns Section'],
-            "description": translator.translate(bns_sections[0]['Description']),
-            "punishment": translator.translate(bns_sections[0]['Punishment']),
-            "bailability": translator.translate(bns_sections[0]['Bailable/Non-Bailable']),
-            "cognizable": translator.translate(bns_sections[0]['Cognizable/Non-Cognizable']),
-            "category": translator.translate(bns_sections[0]['Category'])
-        },
-        "other_sections": [
-            {
-                "section_number": sec['bns Section'],
-                "description": translator.translate(sec['Description']),
-                "punishment": translator.translate(sec['Punishment']),
-                "bailability": translator.translate(sec['Bailable/Non-Bailable']),
-                "cognizable": translator.translate(sec['Cognizable/Non-Cognizable']),
-                "category": translator.translate(sec['Category'])
-            }
-            for sec in bns_sections[1:]
-        ],
-        "recommended_actions": [
-            translator.translate("File complaint at nearest police station"),
-            translator.translate("Keep all evidence safe"),
-            translator.translate("Get legal advice from a lawyer"),
-            translator.translate("Ensure your safety"),
-            translator.translate("Keep copy of FIR")
-        ]
+        "main_section": summary_entry(localized.sections[0]),
+        "other_sections": [summary_entry(sec) for sec in localized.sections[1:]],
+        "recommended_actions": recommended_actions
     }
 
     # Add summary section to formatted output
     formatted_output.append("\n" + "=" * 80)
-    formatted_output.append(f"✅ {translator.translate('Processing completed successfully!')}")
+    formatted_output.append(f"✅ {t('Processing completed successfully!')}")
     formatted_output.append("=" * 80)
 
-    formatted_output.append(f"\n📁 {translator.translate('Generated Files')}:")
-    formatted_output.append(f"🎵 {translator.translate('Audio file')}: {audio_file_url}") # Changed to audio_file_url
-    formatted_output.append(f"📄 {translator.translate('English PDF')}: {pdf_en}")
-    formatted_output.append(f"📄 {translator.translate('Regional PDF')}: {pdf_regional}")
+    formatted_output.append(f"\n📁 {t('Generated Files')}:")
+    formatted_output.append(f"🎵 {t('Audio file')}: {audio_file_url}") # Changed to audio_file_url
+    formatted_output.append(f"📄 {t('English PDF')}: {pdf_en}")
+    formatted_output.append(f"📄 {t('Regional PDF')}: {pdf_regional}")
 
-    formatted_output.append(f"\n🌐 {translator.translate('Language Information')}:")
-    formatted_output.append(f"{translator.translate('Detected Language')}: {original_lang}")
-    formatted_output.append(f"{translator.translate('Regional Language')}: {original_lang}")
+    formatted_output.append(f"\n🌐 {t('Language Information')}:")
+    formatted_output.append(f"{t('Detected Language')}: {original_lang}")
+    formatted_output.append(f"{t('Regional Language')}: {original_lang}")
 
-    formatted_output.append(f"\n📝 {translator.translate('Transcribed Text')}:")
+    formatted_output.append(f"\n📝 {t('Transcribed Text')}:")
     formatted_output.append(f"{text}")
 
-    formatted_output.append(f"\n📊 {translator.translate('bns Summary')}:")
-    formatted_output.append(f"{translator.translate('Total bns Sections Found')}: {len(bns_sections)}")
+    formatted_output.append(f"\n📊 {t('bns Summary')}:")
+    formatted_output.append(f"{t('Total bns Sections Found')}: {len(bns_sections)}")
     # ⭐ MODIFIED: Use .get() for 'Name' with fallback
-    formatted_output.append(f"{translator.translate('Main Section')}: {bns_sections[0]['bns Section']}")
+    formatted_output.append(f"{t('Main Section')}: {bns_sections[0]['bns Section']}")
 
     if len(bns_sections) > 1:
-        formatted_output.append(f"{translator.translate('Other Sections')}: {len(bns_sections) - 1} {translator.translate('additional sections found')}")
+        formatted_output.append(f"{t('Other Sections')}: {len(bns_sections) - 1} {t('additional sections found')}")
 
-    formatted_output.append(f"\n🔍 {translator.translate('Recommended Actions')}:")
+    formatted_output.append(f"\n🔍 {t('Recommended Actions')}:")
     for i, action in enumerate(bns_summary['recommended_actions'], 1):
         formatted_output.append(f"{i}. {action}")
 
     # Join all formatted output
     complete_formatted_output = "\n".join(formatted_output)
 
-    # Adjust paths for URLs to be web-accessible
-    def get_web_url(file_path):
-        if file_path and file_path.startswith(output_dir + os.sep):
-            # Assumes output_dir is 'static/bns_outputs' or similar.
-            # This converts 'static/bns_outputs/file.mp3' to '/static/bns_outputs/file.mp3'
-            return "/" + file_path
-        return file_path
-
-
     return {
         "success": True,
         "audio_url": get_web_url(audio_file_url) if audio_file_url else '', # Ensure it's empty string if None
@@ -405,13 +421,16 @@ def process_audio_pipeline(audio_path, user_details, output_dir="static"):
         "transcribed_text": text,
         "formatted_output": complete_formatted_output,
         "detailed_bns_info": detailed_bns_info,
-        "bns_summary": bns_summary
+        "bns_summary": bns_summary,
+        "asr": asr_info,
+        "stage_timings": {name: outcome["seconds"] for name, outcome in artifacts.items()},
+        "stage_errors": {name: outcome["error"] for name, outcome in artifacts.items() if outcome["error"]}
     }
 
 # Main execution function for testing (for standalone script testing)
 def main():
     # ✅ Install fonts
-    install_fonts()
+    provision_fonts()
 
     # Example usage
     audio_path = "test_audio.mp3"  # Replace with actual audio file
@@ -428,6 +447,7 @@ def main():
     try:
         # Create a dummy audio file for testing if it doesn't exist
         if not os.path.exists(audio_path):
+            from gtts import gTTS  # type: ignore
             print(f"Creating dummy audio file for test: {audio_path}")
             tts_dummy = gTTS(text="This is a test complaint about someone escaping jail.", lang='en')
             tts_dummy.save(audio_path)
@@ -0,0 +1,108 @@
+# embedding_index.py
+#
+# On-disk cache for the query/scheme embedding matrices. Each dataset is
+# stored under INDEX_DIR/<name>/<key>/ where <key> hashes the CSV contents,
+# the encoder names and a format version, so a rebuild only happens when the
+# data or the model changes. Matrices are memory-mapped on load, which lets
+# forked workers share the same page-cache pages.
+#
+# Build everything ahead of time with:
+#     python -m mlModel.embedding_index
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+import warnings
+import numpy as np  # type: ignore
+import torch  # type: ignore
+from config import Config
+
+INDEX_DIR = Config.EMBEDDING_INDEX_DIR
+META_FILE = "meta.json"
+
+# ----------------------------
+# Keys
+# ----------------------------
+def dataset_key(csv_paths, model_names, version="1"):
+    """Hash of the CSV contents, encoder names and build version."""
+    h = hashlib.sha256()
+    h.update(f"v{version}\0".encode())
+    for model_name in model_names:
+        h.update(model_name.encode() + b"\0")
+    for path in csv_paths:
+        with open(path, "rb") as f:
+            h.update(hashlib.sha256(f.read()).digest())
+    return h.hexdigest()[:16]
+
+def to_builtin(value):
+    """Convert numpy scalars (e.g. int64 section numbers) into JSON-safe values."""
+    return value.item() if hasattr(value, "item") else value
+
+# ----------------------------
+# Build / load
+# ----------------------------
+def _write_index(index_dir, arrays, meta):
+    parent = os.path.dirname(index_dir)
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = os.path.join(parent, f".tmp-{uuid.uuid4().hex}")
+    os.makedirs(tmp_dir)
+    try:
+        for array_name, array in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{array_name}.npy"), np.ascontiguousarray(array, dtype=np.float32))
+        # meta.json is written last: its presence marks a complete index
+        with open(os.path.join(tmp_dir, META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"arrays": sorted(arrays), **meta}, f, ensure_ascii=False)
+        os.rename(tmp_dir, index_dir)
+    except OSError:
+        # Another worker finished the same build first; keep theirs
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not os.path.exists(os.path.join(index_dir, META_FILE)):
+            raise
+
+def _prune_stale(name, keep_key):
+    dataset_dir = os.path.join(INDEX_DIR, name)
+    for entry in os.listdir(dataset_dir):
+        if entry != keep_key and not entry.startswith(".tmp-"):
+            shutil.rmtree(os.path.join(dataset_dir, entry), ignore_errors=True)
+
+def _read_index(index_dir):
+    with open(os.path.join(index_dir, META_FILE), encoding="utf-8") as f:
+        meta = json.load(f)
+    arrays = {
+        array_name: np.load(os.path.join(index_dir, f"{array_name}.npy"), mmap_mode="r")
+        for array_name in meta.pop("arrays")
+    }
+    return arrays, meta
+
+def load_or_build(name, csv_paths, model_names, build_fn, version="1"):
+    """
+    Return (arrays, meta) for dataset `name`.
+
+    `build_fn()` must return a dict of 2-D float arrays and a JSON-serialisable
+    meta dict; it is only called when no index exists for the current key.
+    """
+    key = dataset_key(csv_paths, model_names, version)
+    index_dir = os.path.join(INDEX_DIR, name, key)
+    if not os.path.exists(os.path.join(index_dir, META_FILE)):
+        print(f"⏳ Building embedding index '{name}' ({key})...")
+        arrays, meta = build_fn()
+        _write_index(index_dir, arrays, meta)
+        _prune_stale(name, key)
+        print(f"✅ Embedding index '{name}' written to {index_dir}")
+    return _read_index(index_dir)
+
+def as_tensor(array):
+    """Wrap a memory-mapped matrix as a torch tensor without copying it."""
+    with warnings.catch_warnings():
+        # The mapping is read-only on purpose; torch warns about that
+        warnings.simplefilter("ignore", UserWarning)
+        return torch.from_numpy(array)
+
+if __name__ == "__main__":
+    # Importing the pipelines builds (or validates) each of their indexes
+    import mlModel.voice_assistant  # noqa: F401
+    import mlModel.bns_sections  # noqa: F401
+    import mlModel.schemes  # noqa: F401
+    print(f"✅ All embedding indexes are up to date in {INDEX_DIR}")
@@ -0,0 +1,38 @@
+# encoders.py
+#
+# Encoder service for the sentence-transformer models. classify_ipc,
+# classify_bns and recommend_schemes each embed one short query per request;
+# instead of every request thread running the transformer at batch size 1,
+# each model gets a MicroBatcher that coalesces the concurrent encode calls
+# into one padded forward pass and hands every caller back its own row.
+
+import threading
+from config import Config
+from mlModel.model_registry import get_model
+from mlModel.batching import MicroBatcher
+
+_batchers = {}
+_lock = threading.Lock()
+
+def _encode_batch(model_name):
+    def process_batch(texts):
+        # One (len(texts), dim) tensor; the rows are returned in submission order
+        return list(get_model(model_name).encode(texts, convert_to_tensor=True,
+                                                 batch_size=Config.ENCODER_BATCH_MAX_SIZE))
+    return process_batch
+
+def get_encoder(model_name):
+    """The MicroBatcher for `model_name`, created on first use."""
+    with _lock:
+        if model_name not in _batchers:
+            _batchers[model_name] = MicroBatcher(
+                f"encoder:{model_name}", _encode_batch(model_name),
+                max_batch_size=Config.ENCODER_BATCH_MAX_SIZE, max_wait_ms=Config.ENCODER_BATCH_MAX_WAIT_MS,
+            )
+        return _batchers[model_name]
+
+def encode(model_name, text):
+    """Embedding of a single text as a 1-D tensor, same as model.encode(text, convert_to_tensor=True)."""
+    if Config.ENCODER_BATCH_MAX_SIZE <= 1:
+        return get_model(model_name).encode(text, convert_to_tensor=True)
+    return get_encoder(model_name).submit(text).result()
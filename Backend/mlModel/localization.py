@@ -0,0 +1,47 @@
+# localization.py
+#
+# Translate-once view of a pipeline response. Every string a response shows
+# (UI phrases, section fields, TTS narration blocks, the transcript) is
+# gathered up front, translated in a single batch and then only looked up,
+# so each unique string is translated once per request no matter how many
+# places render it.
+
+from mlModel.section_catalog import CATALOG_SPECS
+
+
+class LocalizedSection:
+    """One matched section with its user-facing fields in the target language."""
+
+    def __init__(self, source, spec, strings):
+        self.source = source
+        self.section_id = source[spec["id_key"]]
+        self.fields = {
+            field: strings.get(source[field], source[field])
+            for field in spec["fields"] if field in source
+        }
+        self.audio_block = strings[spec["audio_block"](source)]
+
+    def __getitem__(self, field):
+        return self.fields[field]
+
+    def translated_section(self):
+        """The source section dict with its text fields translated (regional PDF context)."""
+        return {key: self.fields.get(key, value) for key, value in self.source.items()}
+
+
+class LocalizedResponse:
+    def __init__(self, kind, sections, transcript, translator):
+        spec = CATALOG_SPECS[kind]
+        strings = list(spec["phrases"])
+        for section in sections:
+            strings.extend(section[field] for field in spec["fields"] if field in section)
+            strings.append(spec["audio_block"](section))
+        strings.append(transcript)
+
+        self._strings = dict(zip(strings, translator.translate_batch(strings)))
+        self.sections = [LocalizedSection(section, spec, self._strings) for section in sections]
+        self.transcript = self._strings.get(transcript, transcript)
+
+    def phrase(self, text):
+        """Translation of a fixed UI phrase (falls back to the English text)."""
+        return self._strings.get(text, text)
@@ -0,0 +1,109 @@
+# long_audio.py
+#
+# Long-recording mode for ASR. Whisper decodes a recording as a sequence of
+# 30-second windows on one core, so a five-minute narrative costs ten
+# windows back to back. Here recordings longer than
+# Config.ASR_LONG_AUDIO_SECONDS are cut at the quietest point near every
+# chunk boundary, the chunks (with a little overlap) are submitted together
+# to the Whisper micro-batcher so their windows are encoded and decoded as
+# batches in this process, chunks whose detected language disagrees with
+# the majority are re-decoded in that language, and the transcripts are
+# stitched with the duplicated overlap words removed.
+
+import re
+from collections import Counter
+from config import Config
+from mlModel.asr_backends import (
+    get_asr_backend, WhisperBackend, whisper_batcher, WHISPER_WINDOW_SAMPLES, DEFAULT_PROFILE,
+)
+from utils.audio_utils import SAMPLE_RATE, frame_rms
+
+# ----------------------------
+# Splitting and stitching
+# ----------------------------
+def split_at_silence(audio, chunk_seconds=None, overlap_seconds=None, search_seconds=5, frame_ms=30):
+    """
+    (start, end) sample spans covering `audio`. Each cut is placed at the
+    quietest frame in the `search_seconds` before the chunk limit, and
+    every span is widened by `overlap_seconds` on both sides.
+    """
+    chunk = int((chunk_seconds or Config.ASR_CHUNK_SECONDS) * SAMPLE_RATE)
+    overlap = int((Config.ASR_CHUNK_OVERLAP_SECONDS if overlap_seconds is None else overlap_seconds) * SAMPLE_RATE)
+    frame = SAMPLE_RATE * frame_ms // 1000
+    rms = frame_rms(audio, frame_ms)
+
+    cuts = [0]
+    while len(audio) - cuts[-1] > chunk:
+        target = cuts[-1] + chunk
+        lo = max(cuts[-1] + chunk // 2, target - search_seconds * SAMPLE_RATE) // frame
+        hi = min(target // frame, len(rms))
+        cuts.append((lo + int(rms[lo:hi].argmin())) * frame if hi > lo else target)
+    cuts.append(len(audio))
+    return [(max(0, start - overlap), min(len(audio), end + overlap)) for start, end in zip(cuts, cuts[1:])]
+
+def _normalize_word(word):
+    return re.sub(r"\W", "", word.lower())
+
+def stitch_transcripts(texts, max_overlap_words=8):
+    """Join chunk transcripts, dropping words the next chunk repeats from the end of the previous one."""
+    words = []
+    for text in texts:
+        new_words = text.split()
+        repeated = 0
+        for k in range(min(max_overlap_words, len(words), len(new_words)), 0, -1):
+            if [_normalize_word(w) for w in words[-k:]] == [_normalize_word(w) for w in new_words[:k]]:
+                repeated = k
+                break
+        words.extend(new_words[repeated:])
+    return " ".join(words)
+
+# ----------------------------
+# Chunk transcription
+# ----------------------------
+def _transcribe_chunks(chunks, profile, language):
+    """
+    Every chunk fits one Whisper window, so with openai-whisper they all go
+    to the micro-batcher at once and are decoded as batches. No process is
+    forked: torch's thread pools are already running in this one.
+    """
+    backend = get_asr_backend()
+    batchable = all(len(chunk) <= WHISPER_WINDOW_SAMPLES for chunk in chunks)
+    if isinstance(backend, WhisperBackend) and Config.ASR_BATCH_MAX_SIZE > 1 and batchable:
+        futures = [whisper_batcher.submit((chunk, "translate", profile, language)) for chunk in chunks]
+        return [future.result() for future in futures]
+    return [backend.transcribe(chunk, task="translate", profile=profile, language=language) for chunk in chunks]
+
+# ----------------------------
+# Public API
+# ----------------------------
+def should_chunk(audio):
+    """Long-audio mode applies to in-memory samples longer than ASR_LONG_AUDIO_SECONDS."""
+    return (
+        Config.ASR_LONG_AUDIO_SECONDS > 0
+        and not isinstance(audio, str)
+        and len(audio) > Config.ASR_LONG_AUDIO_SECONDS * SAMPLE_RATE
+    )
+
+def transcribe_long(audio, profile=DEFAULT_PROFILE, language=None):
+    """Same result shape as ASRBackend.transcribe, plus the number of chunks."""
+    spans = split_at_silence(audio)
+    chunks = [audio[start:end] for start, end in spans]
+    results = _transcribe_chunks(chunks, profile, language)
+
+    # Majority language by duration; outvoted chunks are decoded again in that language
+    votes = Counter()
+    for (start, end), result in zip(spans, results):
+        votes[result["language"]] += end - start
+    majority = language or votes.most_common(1)[0][0]
+    outvoted = [i for i, result in enumerate(results) if result["language"] != majority]
+    if outvoted:
+        redone = _transcribe_chunks([chunks[i] for i in outvoted], profile, majority)
+        for i, result in zip(outvoted, redone):
+            results[i] = result
+
+    return {
+        "text": stitch_transcripts([result["text"] for result in results]),
+        "language": majority,
+        "chunks": len(chunks),
+        "redecoded_chunks": len(outvoted),
+    }
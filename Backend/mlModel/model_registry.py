@@ -0,0 +1,225 @@
+# model_registry.py
+#
+# One process-wide home for every heavy model. The IPC, BNS and schemes
+# pipelines all ask this module for their models at use time, so each one
+# is loaded lazily, a single time per process no matter how many pipelines
+# import it. With Config.MODEL_MEMORY_BUDGET_BYTES set, loading a model that
+# would push the process over the budget first unloads the least recently
+# used idle models; they are loaded again on their next use. Models pinned
+# by the pre-fork master (serving.preload) are shared with it and never
+# unloaded, and the budget counts only this process's unshared memory.
+
+import ctypes
+import gc
+import os
+import threading
+import time
+from config import Config
+
+# ----------------------------
+# Loaders
+# ----------------------------
+def _load_whisper():
+    # No thread count here: torch's intra-op pool is process-wide and shared with the sentence
+    # encoders, so it is set once per worker from WORKER_TORCH_THREADS (serving.after_fork)
+    import whisper  # type: ignore
+    model = whisper.load_model(Config.WHISPER_MODEL_SIZE, device="cpu")
+    if Config.ASR_QUANTIZE == "int8":
+        import torch  # type: ignore
+        # whisper's Linear subclass only casts weights to the input dtype (a no-op in fp32 on CPU),
+        # but quantize_dynamic matches exact types, so turn them back into plain nn.Linear first
+        for module in model.modules():
+            if isinstance(module, torch.nn.Linear):
+                module.__class__ = torch.nn.Linear
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    return model
+
+def _load_faster_whisper():
+    from faster_whisper import WhisperModel  # type: ignore
+    return WhisperModel(
+        Config.WHISPER_MODEL_SIZE, device="cpu",
+        compute_type="int8" if Config.ASR_QUANTIZE == "int8" else "float32",
+        cpu_threads=Config.ASR_THREADS,
+    )
+
+def _describe_whisper(engine):
+    quantized = f"-{Config.ASR_QUANTIZE}" if Config.ASR_QUANTIZE else ""
+    return f"{engine}-{Config.WHISPER_MODEL_SIZE}{quantized}"
+
+def _load_sentence_transformer(model_name):
+    from sentence_transformers import SentenceTransformer  # type: ignore
+    return SentenceTransformer(model_name)
+
+def _load_indic_translator():
+    from indictrans2 import IndicTranslator  # type: ignore
+    return IndicTranslator()
+
+MODEL_LOADERS = {
+    "whisper": (_load_whisper, lambda: _describe_whisper("whisper")),
+    "faster_whisper": (_load_faster_whisper, lambda: _describe_whisper("faster-whisper")),
+    "multilingual_encoder": (lambda: _load_sentence_transformer(Config.MULTILINGUAL_ENCODER),
+                             lambda: Config.MULTILINGUAL_ENCODER),
+    "query_encoder": (lambda: _load_sentence_transformer(Config.QUERY_ENCODER),
+                      lambda: Config.QUERY_ENCODER),
+    "scheme_encoder": (lambda: _load_sentence_transformer(Config.SCHEME_ENCODER),
+                       lambda: Config.SCHEME_ENCODER),
+    "indic_translator": (_load_indic_translator, lambda: "IndicTrans2"),
+}
+
+_models = {}
+_model_info = {}
+_last_used = {}
+_pinned = set()
+_lock = threading.Lock()
+
+# ----------------------------
+# Memory helpers
+# ----------------------------
+def current_rss_bytes():
+    """Resident set size of this process, or None if it cannot be read."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # ru_maxrss is a peak value (KiB on Linux, bytes on macOS) - best effort only
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except Exception:
+        return None
+
+def private_bytes():
+    """
+    Memory this process does not share with its parent (private clean +
+    dirty pages, i.e. copy-on-write pages it has written to). Falls back to
+    the RSS where /proc/self/smaps_rollup is not available.
+    """
+    try:
+        total = 0
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                    total += int(line.split()[1]) * 1024
+        return total
+    except (OSError, ValueError, IndexError):
+        return current_rss_bytes()
+
+def _tensor_bytes(model):
+    """Bytes held in parameters and buffers of a torch module (None if not a module)."""
+    module = model if hasattr(model, "parameters") else getattr(model, "model", None)
+    if module is None or not hasattr(module, "parameters"):
+        return None
+    total = sum(p.numel() * p.element_size() for p in module.parameters())
+    if hasattr(module, "buffers"):
+        total += sum(b.numel() * b.element_size() for b in module.buffers())
+    return total
+
+def _release_memory():
+    """Return freed heap pages to the OS so the RSS actually drops (glibc only)."""
+    gc.collect()
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+# ----------------------------
+# Memory budget
+# ----------------------------
+def _unload(name):
+    del _models[name]
+    _model_info[name]["evictions"] += 1
+    _release_memory()
+    print(f"✅ Unloaded idle model '{name}' to stay within the memory budget")
+
+def _enforce_budget(reserve=0):
+    """
+    Unload idle models, least recently used first, until the unshared
+    memory plus `reserve` bytes fits the budget. Models used within the
+    last MODEL_IDLE_SECONDS are never unloaded, so a request cannot lose
+    the model it is running on, and pinned models are never unloaded at
+    all: their pages belong to the master, so unloading frees nothing and
+    a reload would make a private copy. Called with _lock held.
+    """
+    budget = Config.MODEL_MEMORY_BUDGET_BYTES
+    if not budget:
+        return
+    now = time.time()
+    idle = sorted(
+        (last_used, name) for name, last_used in _last_used.items()
+        if name in _models and name not in _pinned and now - last_used >= Config.MODEL_IDLE_SECONDS
+    )
+    for _, name in idle:
+        used = private_bytes()
+        if used is None or used + reserve <= budget:
+            return
+        _unload(name)
+    used = private_bytes()
+    if used is not None and used + reserve > budget:
+        print(f"⚠️ Over the model memory budget ({used / 2**20:.0f} MiB unshared) with no idle model to unload")
+
+# ----------------------------
+# Public API
+# ----------------------------
+def get_model(name):
+    """Return the shared instance of `name`, loading it on first use (or again after an eviction)."""
+    model = _models.get(name)
+    if model is not None:
+        _last_used[name] = time.time()
+        return model
+    if name not in MODEL_LOADERS:
+        raise KeyError(f"Unknown model: {name}")
+
+    with _lock:
+        if name in _models:
+            _last_used[name] = time.time()
+            return _models[name]
+        loader, describe = MODEL_LOADERS[name]
+        info = _model_info.setdefault(name, {"name": name, "load_count": 0, "evictions": 0, "total_load_seconds": 0.0})
+        # Make room for what this model took the last time it was loaded
+        _enforce_budget(reserve=max(0, info.get("rss_delta_bytes") or 0))
+        rss_before = current_rss_bytes()
+        started = time.perf_counter()
+        model = loader()
+        load_seconds = time.perf_counter() - started
+        rss_after = current_rss_bytes()
+
+        _models[name] = model
+        _last_used[name] = time.time()
+        info.update(
+            source=describe(),
+            load_seconds=round(load_seconds, 3),
+            load_count=info["load_count"] + 1,
+            total_load_seconds=round(info["total_load_seconds"] + load_seconds, 3),
+            tensor_bytes=_tensor_bytes(model),
+            rss_delta_bytes=(rss_after - rss_before) if rss_before is not None and rss_after is not None else None,
+        )
+        print(f"✅ Loaded model '{name}' ({describe()}) in {load_seconds:.1f}s")
+        _enforce_budget()
+        return model
+
+def pin_model(name):
+    """Load `name` if needed and exempt it from unloading under the memory budget."""
+    model = get_model(name)
+    _pinned.add(name)
+    return model
+
+def is_loaded(name):
+    return name in _models
+
+def has_loaded(name):
+    """True once `name` loaded successfully, even if it has been unloaded since."""
+    return _model_info.get(name, {}).get("load_count", 0) > 0
+
+def resident_models():
+    """Report every model loaded so far, whether it is still resident, and the memory it accounts for."""
+    now = time.time()
+    return {
+        "models": [
+            {**info, "resident": name in _models, "pinned": name in _pinned, "idle_seconds": round(now - _last_used[name], 1)}
+            for name, info in _model_info.items() if name in _last_used
+        ],
+        "process_rss_bytes": current_rss_bytes(),
+        "process_private_bytes": private_bytes(),
+        "memory_budget_bytes": Config.MODEL_MEMORY_BUDGET_BYTES or None,
+    }
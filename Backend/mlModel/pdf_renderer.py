@@ -0,0 +1,123 @@
+# pdf_renderer.py
+#
+# Complaint letter rendering service. All ipc_/bns_ complaint templates are
+# compiled once per process, and WeasyPrint layout runs in a dedicated
+# process pool whose workers each keep a single FontConfiguration, so fonts
+# are resolved once per worker and the CPU-heavy layout never holds the GIL
+# of the request threads.
+
+import glob
+import multiprocessing
+import os
+import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from jinja2 import Environment, FileSystemLoader  # type: ignore
+from config import Config
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
+TEMPLATE_PATTERNS = ("ipc_complaint_template_*.html", "bns_complaint_template_*.html")
+
+# ----------------------------
+# Templates (compiled once)
+# ----------------------------
+_env = Environment(loader=FileSystemLoader(TEMPLATES_DIR), auto_reload=False, cache_size=-1)
+_templates = {}
+
+def precompile_templates():
+    """Compile every complaint template up front; returns the template names."""
+    for pattern in TEMPLATE_PATTERNS:
+        for path in sorted(glob.glob(os.path.join(TEMPLATES_DIR, pattern))):
+            name = os.path.basename(path)
+            _templates[name] = _env.get_template(name)
+    return sorted(_templates)
+
+def render_html(template_name, context):
+    template = _templates.get(template_name) or _env.get_template(template_name)
+    return template.render(**context)
+
+# ----------------------------
+# Fonts (provisioned once per process)
+# ----------------------------
+NOTO_FONTS_DIR = "/usr/share/fonts/truetype/noto"
+_fonts_ready = False
+_fonts_lock = threading.Lock()
+
+def provision_fonts():
+    """Install the Noto/Lohit fonts the regional templates need, if they are missing."""
+    global _fonts_ready
+    if _fonts_ready:
+        return
+    with _fonts_lock:
+        if _fonts_ready:
+            return
+        if os.path.exists(NOTO_FONTS_DIR):
+            print("✅ Fonts already installed.")
+        else:
+            try:
+                subprocess.run(["apt-get", "update"], check=True)
+                subprocess.run([
+                    "apt-get", "install", "fonts-noto", "fonts-noto-cjk", "fonts-lohit-*", "-y"
+                ], check=True)
+                print("✅ Fonts installed successfully.")
+            except Exception as e:
+                # Not retried per request; PDFs fall back to whatever fonts the system has
+                print(f"❌ Font installation failed: {e}")
+        _fonts_ready = True
+
+# ----------------------------
+# WeasyPrint (one FontConfiguration per process)
+# ----------------------------
+_font_config = None
+
+def _init_worker():
+    global _font_config
+    from weasyprint.text.fonts import FontConfiguration  # type: ignore
+    _font_config = FontConfiguration()
+
+def _write_pdf(html_out, output_file):
+    from weasyprint import HTML  # type: ignore
+    if _font_config is None:
+        _init_worker()
+    HTML(string=html_out, base_url=TEMPLATES_DIR).write_pdf(output_file, font_config=_font_config)
+    return output_file
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Not fork: by now this process runs torch and several thread pools, and a fork would
+            # copy whatever locks they hold. The fork server is a clean single-threaded process that
+            # has imported only this module, and every render worker is forked from it.
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("forkserver")
+                context.set_forkserver_preload([__name__])
+            else:
+                context = multiprocessing.get_context("spawn")
+            _pool = ProcessPoolExecutor(
+                max_workers=Config.PDF_RENDER_WORKERS,
+                mp_context=context,
+                initializer=_init_worker,
+            )
+        return _pool
+
+def render_pdf(template_name, context, output_file):
+    """Render `template_name` with `context` into `output_file` and return its path."""
+    global _pool
+    provision_fonts()
+    html_out = render_html(template_name, context)
+    if Config.PDF_RENDER_WORKERS <= 0:
+        return _write_pdf(html_out, output_file)
+    try:
+        return _get_pool().submit(_write_pdf, html_out, output_file).result()
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed); start a fresh pool for the next render
+        with _pool_lock:
+            _pool = None
+        raise
+
+precompile_templates()
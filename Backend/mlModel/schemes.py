@@ -1,8 +1,13 @@
 # schemes_recommender.py
 
 import pandas as pd #type:ignore
-from sentence_transformers import SentenceTransformer, util #type:ignore
+import numpy as np #type:ignore
+import torch #type:ignore
 import os
+from config import Config
+from mlModel.model_registry import get_model
+from mlModel.encoders import encode
+from mlModel.embedding_index import load_or_build, as_tensor
 
 # ----------------------------
 # Load and preprocess the dataset
@@ -41,46 +46,80 @@ def enrich_text(row):
 df['full_text'] = df.apply(enrich_text, axis=1)
 
 # ----------------------------
-# Load the semantic model and encode all schemes
+# Load the precomputed scheme embeddings (the encoder is only loaded to rebuild them)
 # ----------------------------
-model = SentenceTransformer('BAAI/bge-base-en-v1.5')
-scheme_embeddings = model.encode(df['full_text'].tolist(), convert_to_tensor=True)
+def build_scheme_index():
+    model = get_model("scheme_encoder")
+    return {"scheme_embeddings": model.encode(df['full_text'].tolist(), convert_to_numpy=True)}, {}
+
+# Bump the version whenever enrich_text changes, since it is not part of the CSV hash
+index_arrays, _ = load_or_build("schemes", [csv_path], [Config.SCHEME_ENCODER], build_scheme_index, version="1")
+# Unit-length rows, so a query's cosine similarities are one matrix-vector product
+scheme_embeddings = as_tensor(index_arrays["scheme_embeddings"])
+scheme_vectors = torch.nn.functional.normalize(scheme_embeddings.float(), dim=-1).numpy()
 
 # ----------------------------
-# Eligibility check function
+# Precompiled eligibility attributes (one array per column, parsed once at load)
 # ----------------------------
-def is_eligible(row, user_profile):
+def parse_age_bounds(min_ages, max_ages):
+    """
+    Float arrays of the age bounds, NaN where there is no bound. A bound
+    that is not an integer disables the checks it would have raised out of:
+    an unparseable Min Age skips both bounds, an unparseable Max Age only
+    the upper one.
+    """
+    lower, upper = [], []
+    for min_age, max_age in zip(min_ages, max_ages):
+        lo = hi = np.nan
+        try:
+            if str(min_age).lower() not in ['none', 'any']:
+                lo = int(min_age)
+            if str(max_age).lower() not in ['none', 'any']:
+                hi = int(max_age)
+        except (TypeError, ValueError):
+            pass
+        lower.append(lo)
+        upper.append(hi)
+    return np.array(lower, dtype=np.float64), np.array(upper, dtype=np.float64)
+
+min_age, max_age = parse_age_bounds(df['Min Age'], df['Max Age'])
+income_cap = np.array([np.nan if (cap := clean_income(value)) is None else cap
+                       for value in df['Income Max (Annual)']], dtype=np.float64)
+gender = df['Gender'].to_numpy(dtype=str)
+caste = df['Caste'].to_numpy(dtype=str)
+occupation = df['Occupation'].to_numpy(dtype=str)
+state = df['state'].to_numpy(dtype=str)
+
+open_gender = gender == 'any'
+open_caste = caste == 'any'
+open_occupation = np.isin(occupation, ['any', 'none'])
+open_state = np.isin(state, ['any', 'central'])
+
+scheme_records = df[['Scheme Name', 'Category', 'Description', 'Apply Link']].to_dict('records')
+
+def eligible_mask(user_profile):
+    """Boolean array over the schemes: True where the user meets every eligibility attribute."""
+    mask = (open_gender | (gender == user_profile['gender'].lower()))
+    mask &= open_caste | (caste == user_profile['caste'].lower())
+    mask &= open_state | (state == user_profile['state'].lower())
+    # NaN caps and bounds compare False, i.e. never exclude
+    mask &= ~(income_cap < user_profile['income'])
+
     try:
-        if str(row['Min Age']).lower() not in ['none', 'any'] and int(user_profile['age']) < int(row['Min Age']):
-            return False
-        if str(row['Max Age']).lower() not in ['none', 'any'] and int(user_profile['age']) > int(row['Max Age']):
-            return False
-    except:
+        age = int(user_profile['age'])
+        mask &= ~(min_age > age) & ~(max_age < age)
+    except (TypeError, ValueError):
         pass
 
-    if row['Gender'] != 'any' and row['Gender'] != user_profile['gender'].lower():
-        return False
-    if row['Caste'] != 'any' and row['Caste'] != user_profile['caste'].lower():
-        return False
-
-    scheme_income = clean_income(row['Income Max (Annual)'])
-    if scheme_income is not None and user_profile['income'] > scheme_income:
-        return False
-
-    if row['Occupation'] != 'any' and row['Occupation'] != 'none':
-        user_occupations = user_profile['occupation']
-        if isinstance(user_occupations, list):
-            if not any(occ.lower() in row['Occupation'] for occ in user_occupations):
-                return False
-        else:
-            if user_occupations.lower() not in row['Occupation']:
-                return False
-
-    if row['state'] not in ['any', 'central']:
-        if row['state'] != user_profile['state'].lower():
-            return False
-
-    return True
+    user_occupations = user_profile['occupation']
+    if not isinstance(user_occupations, list):
+        user_occupations = [user_occupations]
+    # Substring match: 'farmer' matches 'farmers' and 'small/marginal farmer'
+    occupation_match = np.zeros(len(occupation), dtype=bool)
+    for occ in user_occupations:
+        occupation_match |= np.char.find(occupation, occ.lower()) >= 0
+    mask &= open_occupation | occupation_match
+    return mask
 
 # ----------------------------
 # Recommend top N schemes
@@ -100,27 +139,32 @@ def recommend_schemes(user_query, user_profile, top_k=5):
         )
 
     query_text = f"Represent this government benefit query for retrieval: {user_query.strip()} Context: {user_context.strip()}"
-    query_embedding = model.encode(query_text, convert_to_tensor=True)
-
-    scores = util.cos_sim(query_embedding, scheme_embeddings)[0]
-    sorted_scores_indices = sorted(zip(scores.tolist(), range(len(scores))), reverse=True)
+    query_embedding = encode("scheme_encoder", query_text)
+
+    # Only the eligible schemes are scored, and only the top k of them are sorted
+    eligible = np.flatnonzero(eligible_mask(user_profile))
+    k = min(top_k, len(eligible))
+    if k <= 0:
+        return []
+    query_vector = torch.nn.functional.normalize(query_embedding.float().reshape(-1), dim=0).numpy()
+    scores = scheme_vectors[eligible] @ query_vector
+    top = np.arange(len(eligible))
+    if k < len(eligible):
+        # Everything scoring at least the k-th best, so ties at the cut are settled below like the rest
+        top = np.flatnonzero(scores >= scores[np.argpartition(-scores, k - 1)[k - 1]])
+    # Highest score first; ties go to the later scheme, as a descending sort of (score, index) did
+    top = top[np.lexsort((-eligible[top], -scores[top]))][:k]
 
     recommendations = []
-    count = 0
-
-    for score, idx in sorted_scores_indices:
-        row = df.iloc[idx]
-        if is_eligible(row, user_profile):
-            recommendations.append({
-                'Scheme Name': row['Scheme Name'],
-                'Category': row['Category'],
-                'Description': row['Description'],
-                'Apply Link': row['Apply Link'],
-                'Similarity Score': round(score, 4)
-            })
-            count += 1
-            if count >= top_k:
-                break
+    for i in top:
+        row = scheme_records[eligible[i]]
+        recommendations.append({
+            'Scheme Name': row['Scheme Name'],
+            'Category': row['Category'],
+            'Description': row['Description'],
+            'Apply Link': row['Apply Link'],
+            'Similarity Score': round(float(scores[i]), 4)
+        })
 
     return recommendations
 
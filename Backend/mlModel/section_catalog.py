@@ -0,0 +1,253 @@
+# section_catalog.py
+#
+# Offline catalog of the legal section texts in every supported language.
+# The section CSVs and the fixed UI phrases never change between requests,
+# so they are translated once by
+#
+#     python -m mlModel.section_catalog            # all languages
+#     python -m mlModel.section_catalog hi ta      # selected languages
+#
+# and written to CATALOG_DIR/<kind>_<lang>.json. The pipelines read the
+# catalog directly; live translation is only needed for the user's own
+# transcript, name and location.
+
+import hashlib
+import json
+import os
+import sys
+from functools import lru_cache
+import pandas as pd  # type: ignore
+from config import Config
+
+CATALOG_DIR = Config.SECTION_CATALOG_DIR
+CATALOG_VERSION = "1"
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+# Languages with a complaint template (see get_template_for_lang in the pipelines)
+SUPPORTED_LANGUAGES = ["hi", "en", "gu", "ta", "bn", "pa"]
+
+# ----------------------------
+# Fixed phrases and narration blocks
+# ----------------------------
+IPC_UI_PHRASES = [
+    'Your complaint matches the following IPC sections',
+    'Matched IPC Section',
+    'Description',
+    'Punishment',
+    'Bailability',
+    'Cognizable',
+    'Category',
+    'What to do',
+    'File complaint under this section',
+    'Register FIR at police station',
+    'Keep all evidence safe',
+    'Consult a lawyer',
+    'According to your complaint, the following IPC sections apply:',
+    'Please take the following steps:',
+    'File complaint at nearest police station',
+    'Get legal advice from a lawyer',
+    'Ensure your safety',
+    'Keep copy of FIR',
+    'Processing completed successfully!',
+    'Generated Files',
+    'Audio file',
+    'English PDF',
+    'Regional PDF',
+    'Language Information',
+    'Detected Language',
+    'Regional Language',
+    'Transcribed Text',
+    'IPC Summary',
+    'Total IPC Sections Found',
+    'Main Section',
+    'Other Sections',
+    'additional sections found',
+    'Recommended Actions',
+]
+
+def ipc_audio_block(section):
+    """English narration of one section; translated as a whole for TTS."""
+    return (f"IPC Section: {section['IPC Section']} - {section['Name']}. "
+            f"Description: {section['Description']}. "
+            f"Punishment: {section['Punishment']}. "
+            f"Bailable: {section['Bailable/Non-Bailable']}. "
+            f"Cognizable: {section['Cognizable/Non-Cognizable']}. "
+            f"Category: {section['Category']}.")
+
+
+BNS_UI_PHRASES = [
+    'Your complaint matches the following bns sections',
+    'Matched bns Section',
+    'Description',
+    'Punishment',
+    'Bailability',
+    'Cognizable',
+    'Category',
+    'What to do',
+    'File complaint under this section',
+    'Register FIR at police station',
+    'Keep all evidence safe',
+    'Consult a lawyer',
+    'According to your complaint, the following bns sections apply:',
+    'Please take the following steps:',
+    'File complaint at nearest police station',
+    'Get legal advice from a lawyer',
+    'Ensure your safety',
+    'Keep copy of FIR',
+    'Processing completed successfully!',
+    'Generated Files',
+    'Audio file',
+    'English PDF',
+    'Regional PDF',
+    'Language Information',
+    'Detected Language',
+    'Regional Language',
+    'Transcribed Text',
+    'bns Summary',
+    'Total bns Sections Found',
+    'Main Section',
+    'Other Sections',
+    'additional sections found',
+    'Recommended Actions',
+]
+
+def bns_audio_block(section):
+    """English narration of one section; translated as a whole for TTS."""
+    return (f"bns Section: {section['bns Section']}. "
+            f"Description: {section['Description']}. "
+            f"Punishment: {section['Punishment']}. "
+            f"Bailable: {section['Bailable/Non-Bailable']}. "
+            f"Cognizable: {section['Cognizable/Non-Cognizable']}. "
+            f"Category: {section['Category']}.")
+
+# ----------------------------
+# Catalog specs
+# ----------------------------
+SECTION_FIELDS = ["Description", "Punishment", "Bailable/Non-Bailable", "Cognizable/Non-Cognizable", "Category"]
+
+CATALOG_SPECS = {
+    "ipc": {
+        "csv": os.path.join(DATA_DIR, "VoiceForWeak_IPC_Sections.csv"),
+        "csv_id_column": "IPC Section",
+        "id_key": "IPC Section",
+        "fields": ["Name"] + SECTION_FIELDS,
+        "phrases": IPC_UI_PHRASES,
+        "audio_block": ipc_audio_block,
+    },
+    "bns": {
+        "csv": os.path.join(DATA_DIR, "BNS_Section.csv"),
+        "csv_id_column": "BNS Section",
+        # classify_bns exposes the section number as 'bns Section'
+        "id_key": "bns Section",
+        "fields": SECTION_FIELDS,
+        "phrases": BNS_UI_PHRASES,
+        "audio_block": bns_audio_block,
+    },
+}
+
+def _source_key(spec):
+    """Hash of everything a catalog is derived from; a mismatch means it is stale."""
+    h = hashlib.sha256(f"v{CATALOG_VERSION}\0".encode())
+    with open(spec["csv"], "rb") as f:
+        h.update(f.read())
+    h.update(json.dumps([spec["fields"], spec["phrases"]]).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+def _pipeline_sections(spec):
+    """Section dicts shaped like the ones classify_ipc / classify_bns return."""
+    df = pd.read_csv(spec["csv"])
+    sections = []
+    for record in df.to_dict("records"):
+        section = {field: record[field] for field in spec["fields"]}
+        section[spec["id_key"]] = str(record[spec["csv_id_column"]])
+        sections.append(section)
+    return sections
+
+def _catalog_path(kind, lang):
+    return os.path.join(CATALOG_DIR, f"{kind}_{lang}.json")
+
+# ----------------------------
+# Build
+# ----------------------------
+def build_catalog(kind, lang, translator=None):
+    """Translate every section field, narration block and UI phrase of `kind` into `lang`."""
+    from mlModel.translation_cache import CachedTranslator
+    spec = CATALOG_SPECS[kind]
+    translator = translator or CachedTranslator(source='auto', target=lang)
+    sections = _pipeline_sections(spec)
+
+    sources = list(spec["phrases"])
+    for section in sections:
+        sources.extend(section[field] for field in spec["fields"] if isinstance(section[field], str))
+        sources.append(spec["audio_block"](section))
+    sources = list(dict.fromkeys(sources))
+    phrases = dict(zip(sources, translator.translate_batch(sources)))
+    # CachedTranslator hands back the English text for strings it failed on; the catalog is only
+    # rebuilt when its sources change, so a partial one would keep serving that English indefinitely
+    failed = [text for text in sources if text in getattr(translator, "_failed", ()) or phrases[text] is None]
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {len(sources)} {kind} strings could not be translated to '{lang}'; "
+                           f"catalog not written")
+
+    localized_sections = {}
+    for section in sections:
+        localized = {
+            field: phrases.get(section[field], section[field]) if isinstance(section[field], str) else section[field]
+            for field in spec["fields"]
+        }
+        localized["audio_block"] = phrases[spec["audio_block"](section)]
+        localized_sections[section[spec["id_key"]]] = localized
+
+    os.makedirs(CATALOG_DIR, exist_ok=True)
+    path = _catalog_path(kind, lang)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "kind": kind,
+            "language": lang,
+            "source_key": _source_key(spec),
+            "sections": localized_sections,
+            "phrases": phrases,
+        }, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
+
+# ----------------------------
+# Lookup
+# ----------------------------
+@lru_cache(maxsize=None)
+def load_catalog(kind, lang):
+    """Return the catalog for (kind, lang), or None if it is missing or stale."""
+    path = _catalog_path(kind, lang)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        catalog = json.load(f)
+    if catalog.get("source_key") != _source_key(CATALOG_SPECS[kind]):
+        print(f"⚠️ Section catalog {path} is stale; rebuild with python -m mlModel.section_catalog")
+        return None
+    return catalog
+
+def lookup_section(kind, section_id, lang):
+    """Localized fields of one section, or None when the catalog does not cover it."""
+    catalog = load_catalog(kind, lang)
+    if catalog is None:
+        return None
+    return catalog["sections"].get(str(section_id))
+
+def phrasebook(kind, lang):
+    """{English text: translation} for every string in the catalog (empty if none)."""
+    catalog = load_catalog(kind, lang)
+    return catalog["phrases"] if catalog else {}
+
+if __name__ == "__main__":
+    languages = sys.argv[1:] or SUPPORTED_LANGUAGES
+    failures = 0
+    for kind in CATALOG_SPECS:
+        for lang in languages:
+            try:
+                print(f"✅ Wrote {build_catalog(kind, lang)}")
+            except RuntimeError as e:
+                failures += 1
+                print(f"❌ {e}")
+    sys.exit(1 if failures else 0)
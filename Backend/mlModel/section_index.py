@@ -0,0 +1,48 @@
+# section_index.py
+#
+# Section-level retrieval over the paraphrase query embeddings. Every section
+# owns several example queries; a section's score is the best (max-pooled)
+# cosine similarity among its queries, so top-k always returns k distinct
+# sections from a single vectorised pass.
+
+import torch  # type: ignore
+
+
+class SectionIndex:
+    def __init__(self, query_embeddings, query_sections, section_lookup):
+        """
+        query_embeddings: (n_queries, dim) L2-normalised tensor
+        query_sections:   section ID for each query row
+        section_lookup:   {section ID as str: section record}
+        """
+        self.section_ids = list(section_lookup)
+        self.records = [section_lookup[section_id] for section_id in self.section_ids]
+        position = {section_id: i for i, section_id in enumerate(self.section_ids)}
+
+        # Queries pointing at sections missing from the section table can never be returned
+        keep = [i for i, section in enumerate(query_sections) if str(section) in position]
+        skipped = len(query_sections) - len(keep)
+        if skipped:
+            print(f"⚠️ {skipped} queries reference unknown sections and were left out of the index")
+
+        self.query_embeddings = query_embeddings if not skipped else query_embeddings[keep]
+        self.query_to_section = torch.tensor(
+            [position[str(query_sections[i])] for i in keep], dtype=torch.long
+        )
+        self.num_indexed_sections = int(torch.unique(self.query_to_section).numel())
+
+    def section_scores(self, input_embedding):
+        """Max-pooled similarity of `input_embedding` against every section."""
+        input_embedding = torch.nn.functional.normalize(input_embedding.reshape(1, -1), dim=-1)
+        query_scores = (input_embedding @ self.query_embeddings.T)[0]
+        scores = torch.full((len(self.section_ids),), float("-inf"), dtype=query_scores.dtype)
+        return scores.scatter_reduce(0, self.query_to_section, query_scores, reduce="amax")
+
+    def top_k(self, input_embedding, k=3):
+        """Return [(section record, score)] for the k best distinct sections."""
+        scores = self.section_scores(input_embedding)
+        top = torch.topk(scores, k=min(k, self.num_indexed_sections))
+        return [
+            (self.records[idx], score)
+            for score, idx in zip(top.values.tolist(), top.indices.tolist())
+        ]
@@ -0,0 +1,74 @@
+# stages.py
+#
+# Tiny stage-graph executor for the artifact phase of the pipelines (TTS and
+# the complaint PDFs). Stages whose dependencies are satisfied run
+# concurrently on a shared pool; each records its own wall time, and a
+# failing stage only fails itself (and the stages that depend on it).
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from config import Config
+
+# Shared by every request; bounds how many artifacts are built at once per worker
+_stage_pool = ThreadPoolExecutor(max_workers=Config.ARTIFACT_WORKERS, thread_name_prefix="stage")
+
+
+class Stage:
+    def __init__(self, name, fn, after=()):
+        """fn receives the values of the `after` stages, in order."""
+        self.name = name
+        self.fn = fn
+        self.after = tuple(after)
+
+
+def _timed(stage, args):
+    started = time.perf_counter()
+    try:
+        value, error = stage.fn(*args), None
+    except Exception as e:
+        import traceback
+        print(f"❌ Stage '{stage.name}' failed: {e}\n{traceback.format_exc()}")
+        value, error = None, str(e)
+    return {"value": value, "error": error, "seconds": round(time.perf_counter() - started, 3)}
+
+
+def run_stages(stages, on_done=None):
+    """
+    Run `stages` and return {name: {"value", "error", "seconds"}}.
+
+    on_done(name, outcome) is called from the calling thread as each stage
+    finishes, so callers can report progress per artifact.
+    """
+    names = {stage.name for stage in stages}
+    for stage in stages:
+        unknown = set(stage.after) - names
+        if unknown:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {sorted(unknown)}")
+
+    results, running = {}, {}
+    pending = {stage.name: stage for stage in stages}
+
+    def finish(name, outcome):
+        results[name] = outcome
+        if on_done:
+            on_done(name, outcome)
+
+    while pending or running:
+        for name, stage in list(pending.items()):
+            if not all(dep in results for dep in stage.after):
+                continue
+            del pending[name]
+            failed = [dep for dep in stage.after if results[dep]["error"]]
+            if failed:
+                finish(name, {"value": None, "error": f"skipped because {', '.join(failed)} failed", "seconds": 0.0})
+            else:
+                args = [results[dep]["value"] for dep in stage.after]
+                running[_stage_pool.submit(_timed, stage, args)] = name
+        if not running:
+            if pending and not any(all(dep in results for dep in s.after) for s in pending.values()):
+                raise ValueError(f"Stage graph has a cycle among: {sorted(pending)}")
+            continue
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            finish(running.pop(future), future.result())
+    return results
@@ -0,0 +1,166 @@
+# translation_backends.py
+#
+# Translation engines behind CachedTranslator. Every backend takes a list of
+# strings and returns a list of the same length holding either the
+# translation or None for strings it could not translate, so callers can fall
+# back string by string. The active chain is chosen in Config.
+
+from abc import ABC, abstractmethod
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from config import Config
+from mlModel.model_registry import get_model
+
+class TranslationBackend(ABC):
+    name = None
+
+    @abstractmethod
+    def translate_batch(self, texts, source, target):
+        """One translation (or None) per text, in order."""
+
+# ----------------------------
+# Remote: Google Translate via deep_translator
+# ----------------------------
+# Shared by every request so the number of concurrent remote calls stays bounded per worker
+_dispatch_pool = ThreadPoolExecutor(max_workers=Config.TRANSLATION_MAX_WORKERS, thread_name_prefix="translate")
+# deep_translator rejects longer text; transcripts of long recordings are split below this
+GOOGLE_MAX_CHARS = 4500
+
+def _split_text(text, limit=GOOGLE_MAX_CHARS):
+    """Pieces of at most `limit` characters, cut at a sentence or word boundary where there is one."""
+    pieces = []
+    while len(text) > limit:
+        cut = max(text.rfind(mark, 0, limit) for mark in (". ", "? ", "! ", "। ", "\n"))
+        if cut <= 0:
+            cut = text.rfind(" ", 0, limit)
+        cut = cut + 1 if cut > 0 else limit
+        pieces.append(text[:cut].strip())
+        text = text[cut:]
+    pieces.append(text.strip())
+    return [piece for piece in pieces if piece] or [text]
+
+class GoogleBackend(TranslationBackend):
+    name = "google"
+
+    def __init__(self, timeout=Config.TRANSLATION_REMOTE_TIMEOUT, cooldown=Config.TRANSLATION_REMOTE_COOLDOWN):
+        self.timeout = timeout
+        self.cooldown = cooldown
+        self._unavailable_until = 0.0
+        # Calls that outlived their batch's timeout; a running thread cannot be cancelled
+        self._stalled = []
+
+    @staticmethod
+    def _translate_one(text, source, target):
+        from deep_translator import GoogleTranslator   # type: ignore
+        # GoogleTranslator mutates its request params, so each call gets its own instance
+        return GoogleTranslator(source=source, target=target).translate(text)
+
+    @staticmethod
+    def _is_transport_error(error):
+        import requests  # type: ignore
+        from deep_translator.exceptions import RequestError, TooManyRequests  # type: ignore
+        return isinstance(error, (requests.RequestException, RequestError, TooManyRequests))
+
+    def translate_batch(self, texts, source, target):
+        # After a network failure, skip the network for a while instead of making every request wait,
+        # and do not queue new calls behind ones still stuck in the pool
+        self._stalled = [future for future in self._stalled if not future.done()]
+        if time.monotonic() < self._unavailable_until or self._stalled:
+            return [None] * len(texts)
+
+        pieces = [_split_text(text) for text in texts]
+        futures = [[_dispatch_pool.submit(self._translate_one, piece, source, target) for piece in text_pieces]
+                   for text_pieces in pieces]
+        wait([future for text_futures in futures for future in text_futures], timeout=self.timeout)
+
+        results = []
+        unreachable = False
+        for text_futures in futures:
+            translated = []
+            for future in text_futures:
+                if not future.done():
+                    # Cancels calls still queued; a running one is remembered until it returns
+                    if not future.cancel():
+                        self._stalled.append(future)
+                    unreachable = True
+                elif future.exception() is not None:
+                    # Bad input (e.g. text deep_translator rejects) fails only its own string
+                    unreachable = unreachable or self._is_transport_error(future.exception())
+                elif isinstance(future.result(), str):
+                    translated.append(future.result())
+            results.append(" ".join(translated) if len(translated) == len(text_futures) else None)
+
+        if unreachable:
+            print(f"⚠️ Google translation unavailable, skipping it for {self.cooldown}s")
+            self._unavailable_until = time.monotonic() + self.cooldown
+        elif any(result is None for result in results):
+            print(f"⚠️ Google could not translate {results.count(None)} of {len(texts)} strings")
+        return results
+
+# ----------------------------
+# Local: IndicTrans2 on CPU
+# ----------------------------
+# FLORES-200 codes used by IndicTrans2
+INDICTRANS_LANG_CODES = {
+    "en": "eng_Latn", "hi": "hin_Deva", "gu": "guj_Gujr",
+    "ta": "tam_Taml", "bn": "ben_Beng", "pa": "pan_Guru",
+}
+
+class IndicTransBackend(TranslationBackend):
+    name = "indictrans2"
+
+    def __init__(self, batch_size=Config.INDICTRANS_BATCH_SIZE):
+        self.batch_size = batch_size
+        # The model is shared process-wide; one batch runs at a time and uses all intra-op threads
+        self._lock = threading.Lock()
+
+    def _run_batch(self, model, batch, src_lang, tgt_lang):
+        if hasattr(model, "batch_translate"):
+            return model.batch_translate(batch, src_lang, tgt_lang)
+        return [model.translate(text, src_lang=src_lang, tgt_lang=tgt_lang) for text in batch]
+
+    def translate_batch(self, texts, source, target):
+        # Pipeline sources are English (section texts and Whisper's English transcript)
+        src_lang = INDICTRANS_LANG_CODES.get("en" if source == "auto" else source)
+        tgt_lang = INDICTRANS_LANG_CODES.get(target)
+        if src_lang is None or tgt_lang is None:
+            return [None] * len(texts)
+        if src_lang == tgt_lang:
+            return list(texts)
+
+        try:
+            model = get_model("indic_translator")
+        except Exception as e:
+            print(f"⚠️ IndicTrans2 unavailable: {e}")
+            return [None] * len(texts)
+
+        results = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            try:
+                with self._lock:
+                    results.extend(self._run_batch(model, batch, src_lang, tgt_lang))
+            except Exception as e:
+                print(f"⚠️ IndicTrans2 batch failed: {e}")
+                results.extend([None] * len(batch))
+        return results
+
+# ----------------------------
+# Selection
+# ----------------------------
+BACKENDS = {
+    GoogleBackend.name: GoogleBackend,
+    IndicTransBackend.name: IndicTransBackend,
+}
+_instances = {}
+
+def get_backend(name):
+    if name not in _instances:
+        _instances[name] = BACKENDS[name]()
+    return _instances[name]
+
+def configured_backends():
+    """Primary backend followed by the optional fallback, as configured in Config."""
+    names = [Config.TRANSLATION_BACKEND, Config.TRANSLATION_FALLBACK_BACKEND]
+    return [get_backend(name) for name in dict.fromkeys(n for n in names if n)]
@@ -0,0 +1,195 @@
+# translation_cache.py
+#
+# Two-tier cache for translations keyed by (source text, target language,
+# backend): an in-process LRU in front of a SQLite file shared by every
+# worker on the box. The SQLite tier is trimmed back under a byte budget,
+# dropping the least recently used rows first.
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from config import Config
+from mlModel.translation_backends import configured_backends
+
+# ----------------------------
+# Cache
+# ----------------------------
+class TranslationCache:
+    def __init__(self, db_path, memory_items=4096, max_disk_bytes=64 * 1024 * 1024):
+        self.db_path = db_path
+        self.memory_items = memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self._local = threading.local()
+        self._puts_since_trim = 0
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    @staticmethod
+    def make_key(text, target, backend):
+        return hashlib.sha256(f"{backend}\0{target}\0{text}".encode("utf-8")).hexdigest()
+
+    def _connection(self):
+        # One connection per thread and per process (connections must not cross a fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                " key TEXT PRIMARY KEY, target TEXT, backend TEXT, translation TEXT,"
+                " size INTEGER, last_used REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations(last_used)")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _remember(self, key, translation):
+        with self._memory_lock:
+            self._memory[key] = translation
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def get(self, text, target, backends):
+        """Cached translation from the first of `backends` (a name or list of names) that has one."""
+        keys = [self.make_key(text, target, backend) for backend in ([backends] if isinstance(backends, str) else backends)]
+        with self._memory_lock:
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    self.counters["memory_hits"] += 1
+                    return self._memory[key]
+        row = None
+        try:
+            conn = self._connection()
+            for key in keys:
+                row = conn.execute("SELECT translation FROM translations WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE translations SET last_used = ? WHERE key = ?", (time.time(), key))
+                    conn.commit()
+                    break
+        except sqlite3.Error as e:
+            print(f"⚠️ Translation cache read failed: {e}")
+            row = None
+        if row is None:
+            self.counters["misses"] += 1
+            return None
+        self.counters["disk_hits"] += 1
+        self._remember(key, row[0])
+        return row[0]
+
+    def put(self, text, target, backend, translation):
+        key = self.make_key(text, target, backend)
+        self._remember(key, translation)
+        try:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)",
+                (key, target, backend, translation, len(text.encode("utf-8")) + len(translation.encode("utf-8")), time.time())
+            )
+            conn.commit()
+            self.counters["writes"] += 1
+            self._puts_since_trim += 1
+            if self._puts_since_trim >= 100:
+                self._puts_since_trim = 0
+                self.trim()
+        except sqlite3.Error as e:
+            print(f"⚠️ Translation cache write failed: {e}")
+
+    def trim(self):
+        """Evict least recently used rows until the SQLite tier fits its byte budget."""
+        conn = self._connection()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        # Trim to 90% so we do not evict again on the very next write
+        excess = total - int(self.max_disk_bytes * 0.9)
+        freed, victims = 0, []
+        for key, size in conn.execute("SELECT key, size FROM translations ORDER BY last_used"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM translations WHERE key = ?", victims)
+        conn.commit()
+        self.counters["evictions"] += len(victims)
+
+    def stats(self):
+        lookups = self.counters["memory_hits"] + self.counters["disk_hits"] + self.counters["misses"]
+        hits = lookups - self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_rate": round(hits / lookups, 4) if lookups else None,
+            "memory_entries": len(self._memory),
+        }
+
+translation_cache = TranslationCache(
+    Config.TRANSLATION_CACHE_PATH,
+    memory_items=Config.TRANSLATION_CACHE_MEMORY_ITEMS,
+    max_disk_bytes=Config.TRANSLATION_CACHE_MAX_BYTES,
+)
+
+# ----------------------------
+# Cached translator (drop-in for GoogleTranslator(...).translate)
+# ----------------------------
+class CachedTranslator:
+    def __init__(self, source='auto', target='en', cache=translation_cache, phrasebook=None, backends=None):
+        self.source = source
+        self.target = target
+        self.cache = cache
+        # Known translations (e.g. the offline section catalog), consulted before the cache
+        self.phrasebook = phrasebook or {}
+        # Tried in order; later backends only see strings the earlier ones failed on
+        self.backends = backends or configured_backends()
+        # Strings that no backend could translate during this translator's lifetime
+        self._failed = set()
+
+    def translate(self, text):
+        return self.translate_batch([text])[0]
+
+    def translate_batch(self, texts):
+        """
+        Translate a list of strings, returning results in the same order.
+
+        Cache misses are de-duplicated and handed to the configured backends in
+        one batch. A string that every backend fails on falls back to the
+        original text (and is not retried for the rest of this translator's life).
+        """
+        results = list(texts)
+        backend_names = [backend.name for backend in self.backends]
+        pending = {}
+        for i, text in enumerate(texts):
+            if not isinstance(text, str) or not text.strip() or text in self._failed:
+                continue
+            if text in self.phrasebook:
+                results[i] = self.phrasebook[text]
+                continue
+            cached = self.cache.get(text, self.target, backend_names)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.setdefault(text, []).append(i)
+
+        remaining = list(pending)
+        for backend in self.backends:
+            if not remaining:
+                break
+            still_missing = []
+            for text, translation in zip(remaining, backend.translate_batch(remaining, self.source, self.target)):
+                if translation is None:
+                    still_missing.append(text)
+                    continue
+                self.cache.put(text, self.target, backend.name, translation)
+                for i in pending[text]:
+                    results[i] = translation
+            remaining = still_missing
+
+        if remaining:
+            print(f"⚠️ {len(remaining)} strings could not be translated to '{self.target}'; keeping the original text")
+            self._failed.update(remaining)
+        return results
@@ -0,0 +1,102 @@
+# tts_backends.py
+#
+# Text-to-speech engines for the complaint narration. A narration is a list
+# of segments (header, one block per matched section, the action list); each
+# segment is synthesized on its own and stored in the content-addressed
+# artifact store under (engine, language, text), so a segment already spoken
+# in that language is never synthesized again. Missing segments are
+# synthesized in parallel and the MP3s are concatenated frame-wise into the
+# final file. The active engine is chosen in Config.
+
+import subprocess
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from mlModel.artifacts import artifact_store
+
+class TTSBackend(ABC):
+    name = None
+
+    @abstractmethod
+    def synthesize(self, text, lang, output_file):
+        """Write `text` spoken in `lang` to `output_file` as MP3."""
+
+# ----------------------------
+# Remote: Google TTS via gTTS
+# ----------------------------
+class GTTSBackend(TTSBackend):
+    name = "gtts"
+
+    def synthesize(self, text, lang, output_file):
+        from gtts import gTTS  # type: ignore
+        gTTS(text=text, lang=lang).save(output_file)
+
+# ----------------------------
+# Local: eSpeak NG (offline), encoded to MP3 by ffmpeg
+# ----------------------------
+class ESpeakBackend(TTSBackend):
+    name = "espeak"
+
+    def synthesize(self, text, lang, output_file):
+        wav = subprocess.run(["espeak-ng", "-v", lang, "--stdout", text], check=True, capture_output=True).stdout
+        # Same layout as gTTS output (24 kHz mono) and no ID3 header, so segments concatenate cleanly
+        subprocess.run([
+            "ffmpeg", "-loglevel", "error", "-y", "-f", "wav", "-i", "pipe:0",
+            "-ac", "1", "-ar", "24000", "-codec:a", "libmp3lame", "-b:a", "64k",
+            "-id3v2_version", "0", "-write_xing", "0", output_file
+        ], input=wav, check=True, capture_output=True)
+
+# ----------------------------
+# Stub: silence, for tests and machines without network or eSpeak
+# ----------------------------
+# One MPEG-1 Layer III frame (32 kbps, 32 kHz, mono) with empty side info: 36 ms of silence
+_SILENT_FRAME = bytes([0xFF, 0xFB, 0x18, 0xC0]) + bytes(140)
+
+class SilentBackend(TTSBackend):
+    name = "silent"
+
+    def synthesize(self, text, lang, output_file):
+        # Roughly as long as the text would take to speak (~70 ms per character)
+        with open(output_file, "wb") as f:
+            f.write(_SILENT_FRAME * max(1, 2 * len(text)))
+
+# ----------------------------
+# Selection
+# ----------------------------
+BACKENDS = {
+    GTTSBackend.name: GTTSBackend,
+    ESpeakBackend.name: ESpeakBackend,
+    SilentBackend.name: SilentBackend,
+}
+_instances = {}
+
+def get_backend(name=None):
+    name = name or Config.TTS_BACKEND
+    if name not in _instances:
+        _instances[name] = BACKENDS[name]()
+    return _instances[name]
+
+# ----------------------------
+# Segmented synthesis
+# ----------------------------
+# Shared by every request so the number of concurrent synthesis calls stays bounded per worker
+_segment_pool = ThreadPoolExecutor(max_workers=Config.TTS_MAX_WORKERS, thread_name_prefix="tts")
+
+def synthesize_segment(text, lang, backend):
+    """Path of the stored MP3 for one segment, synthesized only if it is not cached yet."""
+    engine = get_backend(backend)
+    return artifact_store.cached(
+        "tts_segment", engine.name, ".mp3",
+        lambda output_file, text, lang: engine.synthesize(text, lang, output_file),
+        text=text, lang=lang,
+    )
+
+def synthesize_segments(segments, lang, output_file, backend=None):
+    """Synthesize each segment (in parallel, cached) and concatenate them into output_file."""
+    segments = [segment for segment in segments if segment and segment.strip()]
+    paths = list(_segment_pool.map(lambda segment: synthesize_segment(segment, lang, backend), segments))
+    with open(output_file, "wb") as out:
+        for path in paths:
+            with open(path, "rb") as f:
+                out.write(f.read())
+    return output_file
@@ -1,72 +1,94 @@
 import os
+import time
 import uuid
 import pandas as pd  # type: ignore
-import whisper  # type: ignore
-import torch  # type: ignore
-from sentence_transformers import SentenceTransformer, util  # type: ignore
-from indictrans2 import IndicTranslator  # type: ignore
-from gtts import gTTS  # type: ignore
-from jinja2 import Environment, FileSystemLoader  # type: ignore
-from weasyprint import HTML  # type: ignore
-from deep_translator import GoogleTranslator   # type: ignore
 import datetime
 from langdetect import detect  # type: ignore
-import subprocess
 import smtplib
 from email.message import EmailMessage
-
-# ✅ Auto-install fonts for regional language PDF support
-def install_fonts():
-    noto_path = "/usr/share/fonts/truetype/noto"
-    if not os.path.exists(noto_path):
-        try:
-            subprocess.run(["apt-get", "update"], check=True)
-            subprocess.run([
-                "apt-get", "install", "fonts-noto", "fonts-noto-cjk", "fonts-lohit-*", "-y"
-            ], check=True)
-            print("✅ Fonts installed successfully.")
-        except Exception as e:
-            print(f"❌ Font installation failed: {e}")
-    else:
-        print("✅ Fonts already installed.")
-
-# Load Models
-whisper_model = whisper.load_model("medium")
-text_model = SentenceTransformer('sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2')
-sbert = SentenceTransformer('all-MiniLM-L6-v2')
-translator_indic = IndicTranslator()
+from config import Config
+from mlModel.model_registry import get_model
+from mlModel.encoders import encode
+from mlModel.asr_backends import get_asr_backend, DEFAULT_PROFILE
+from mlModel.long_audio import should_chunk, transcribe_long
+from mlModel.embedding_index import load_or_build, as_tensor, to_builtin
+from mlModel.section_index import SectionIndex
+from mlModel.translation_cache import CachedTranslator
+from mlModel.section_catalog import lookup_section, phrasebook
+from mlModel.localization import LocalizedResponse
+from mlModel.stages import Stage, run_stages
+from mlModel.artifacts import artifact_store
+from mlModel.pdf_renderer import provision_fonts
 
 # Load CSVs
 BASE_DIR = os.path.dirname(__file__)
 DATA_DIR = os.path.join(BASE_DIR, "data")
-df_queries = pd.read_csv(os.path.join(DATA_DIR, "VoiceForWeak_Queries.csv"))
-df_sections = pd.read_csv(os.path.join(DATA_DIR, "VoiceForWeak_IPC_Sections.csv"))
-
-query_columns = [f"Query{i}" for i in range(1, 11)]
-all_queries, ipc_mapping = [], []
-for idx, row in df_queries.iterrows():
-    for col in query_columns:
-        if pd.notna(row[col]):
-            all_queries.append(row[col])
-            ipc_mapping.append(row['IPC Section'])
-
-stored_embeddings = text_model.encode(all_queries, convert_to_tensor=True)
-query_embeddings = sbert.encode(all_queries, convert_to_tensor=True)
-
-def transcribe_audio(path):
-    result = whisper_model.transcribe(path, task="translate")
-    return result['text'], result['language']
+QUERIES_CSV = os.path.join(DATA_DIR, "VoiceForWeak_Queries.csv")
+SECTIONS_CSV = os.path.join(DATA_DIR, "VoiceForWeak_IPC_Sections.csv")
+
+def build_ipc_index():
+    df_queries = pd.read_csv(QUERIES_CSV)
+    df_sections = pd.read_csv(SECTIONS_CSV)
+    section_lookup = {
+        str(to_builtin(record['IPC Section'])): {k: to_builtin(v) for k, v in record.items()}
+        for record in df_sections.to_dict('records')
+    }
+    query_columns = [f"Query{i}" for i in range(1, 11)]
+    all_queries, ipc_mapping = [], []
+    for idx, row in df_queries.iterrows():
+        for col in query_columns:
+            # Queries for sections missing from the section table could never be returned
+            if pd.notna(row[col]) and str(to_builtin(row['IPC Section'])) in section_lookup:
+                all_queries.append(row[col])
+                ipc_mapping.append(to_builtin(row['IPC Section']))
+
+    arrays = {
+        # Models come from the registry at use time, so they are only loaded when an index is rebuilt
+        "query_embeddings": get_model("query_encoder").encode(all_queries, convert_to_numpy=True, normalize_embeddings=True),
+    }
+    meta = {
+        "ipc_mapping": ipc_mapping,
+        "section_lookup": section_lookup,
+    }
+    return arrays, meta
+
+# Embeddings are memory-mapped from disk and only re-encoded when the CSVs or encoders change
+index_arrays, index_meta = load_or_build(
+    "ipc", [QUERIES_CSV, SECTIONS_CSV],
+    [Config.QUERY_ENCODER], build_ipc_index, version="3"
+)
+query_embeddings = as_tensor(index_arrays["query_embeddings"])
+ipc_mapping = index_meta["ipc_mapping"]
+section_lookup = index_meta["section_lookup"]
+ipc_index = SectionIndex(query_embeddings, ipc_mapping, section_lookup)
+
+def transcribe_audio(audio, quality=DEFAULT_PROFILE, language=None):
+    """
+    `audio` is a file path or 16 kHz mono float32 samples (utils.audio_utils.ingest_audio).
+    Returns (text, language, asr_info); asr_info records the decoding profile and time.
+    """
+    backend = get_asr_backend()
+    started = time.perf_counter()
+    if should_chunk(audio):
+        # Long recordings are split at silences and the chunks transcribed in parallel
+        result = transcribe_long(audio, profile=quality, language=language)
+    else:
+        result = backend.transcribe(audio, task="translate", profile=quality, language=language)
+    asr_info = {
+        "backend": backend.name,
+        "profile": quality,
+        "language_hint": language,
+        "chunks": result.get("chunks", 1),
+        "decode_seconds": round(time.perf_counter() - started, 3),
+    }
+    return result['text'], result['language'], asr_info
 
 def classify_ipc(text, top_k=3):
-    input_embedding = sbert.encode(text, convert_to_tensor=True)
-    cos_scores = util.pytorch_cos_sim(input_embedding, query_embeddings)[0]
-    top_indices = torch.topk(cos_scores, k=top_k).indices.tolist()
+    input_embedding = encode("query_encoder", text)
     top_sections = []
-    for idx in top_indices:
-        section = ipc_mapping[idx]
-        info = df_sections[df_sections['IPC Section'] == section].iloc[0].to_dict()
+    for info, score in ipc_index.top_k(input_embedding, k=top_k):
         top_sections.append({
-            "IPC Section": section,
+            "IPC Section": info['IPC Section'],
             "Name": info['Name'],
             "Description": info['Description'],
             "Punishment": info['Punishment'],
@@ -76,26 +98,23 @@ def classify_ipc(text, top_k=3):
         })
     return top_sections
 
-def speak_text(text, original_lang, filename="ipc_output.mp3"):
+def speak_text(segments, original_lang, filename="ipc_output.mp3"):
     gtts_lang_map = {
         "hi": "hi", "en": "en", "gu": "gu",
         "ta": "ta", "bn": "bn", "pa": "pa"
     }
     lang_code = gtts_lang_map.get(original_lang, "en")
-    try:
-        tts = gTTS(text=text, lang=lang_code)
-        tts.save(filename)
-        return filename
-    except Exception as e:
-        return None
+    if isinstance(segments, str):
+        segments = [segments]
+    # Failures propagate so the audio stage reports them in stage_errors
+    return artifact_store.produce("tts", filename, segments=list(segments), lang=lang_code,
+                                  backend=Config.TTS_BACKEND)
 
 def create_letter_pdf(user_name, user_location, details, section_data, other_sections=None,
                       gender="Male", age="30", phone="NA", id_number="NA", email="NA",
                       original_lang="en", output_file="ipc_letter.pdf"):
     template_file = get_template_for_lang(original_lang)
-    env = Environment(loader=FileSystemLoader("templates"))
-    template = env.get_template(template_file)
-    html_out = template.render(
+    return artifact_store.produce("pdf", output_file, template_name=template_file, context=dict(
         Current_Date=datetime.date.today().strftime("%d-%m-%Y"),
         Police_Station_or_Department_Name="Concerned Police Station",
         District_City=user_location,
@@ -117,9 +136,7 @@ def create_letter_pdf(user_name, user_location, details, section_data, other_sec
         Signature_or_Thumb="Signature",
         Village_District=user_location,
         Other_IPC_Sections=other_sections or []
-    )
-    HTML(string=html_out).write_pdf(output_file)
-    return output_file
+    ))
 
 def get_template_for_lang(original_lang):
     templates = {
@@ -133,6 +150,10 @@ def get_template_for_lang(original_lang):
     return templates.get(original_lang, "ipc_complaint_template_en.html")
 
 def deep_translate_section(section, translator):
+    # Catalogued sections are read straight from the offline section catalog
+    localized = lookup_section("ipc", section['IPC Section'], translator.target)
+    if localized is not None:
+        return {key: localized.get(key, value) for key, value in section.items()}
     return {
         key: translator.translate(value) if isinstance(value, str) else value
         for key, value in section.items()
@@ -144,7 +165,7 @@ def conditional_translate(text, target_lang):
             return text
         detected_lang = detect(text)
         if detected_lang != target_lang:
-            return GoogleTranslator(source='auto', target=target_lang).translate(text)
+            return CachedTranslator(source='auto', target=target_lang).translate(text)
         return text
     except:
         return text
@@ -169,18 +190,42 @@ def send_email_with_attachments(recipient, subject, body, attachments):
     except Exception as e:
         return False
 
-def process_audio_pipeline(audio_path, user_details, output_dir="static"):
-    # ✅ Install fonts before PDF generation
-    install_fonts()
+def _notify(on_progress, stage, progress, **data):
+    """Reports a pipeline milestone (and whatever it produced) to the caller."""
+    if on_progress:
+        on_progress(stage, progress, data)
 
-    text, original_lang = transcribe_audio(audio_path)
+def process_audio_pipeline(audio, user_details, output_dir="static", on_progress=None,
+                           quality=DEFAULT_PROFILE, language=None):
+    text, original_lang, asr_info = transcribe_audio(audio, quality=quality, language=language)
+    _notify(on_progress, "transcribed", 30, transcribed_text=text, language=original_lang, asr=asr_info)
 
     ipc_sections = classify_ipc(text)
+    _notify(on_progress, "classified", 40,
+            matched_sections=[section['IPC Section'] for section in ipc_sections], ipc_sections=ipc_sections)
     main_section = ipc_sections[0]
     other_sections = ipc_sections[1:] if len(ipc_sections) > 1 else []
 
-    translator = GoogleTranslator(source='auto', target=original_lang)
-    
+    translator = CachedTranslator(source='auto', target=original_lang, phrasebook=phrasebook("ipc", original_lang))
+
+    # ✅ Every string of the response is translated exactly once, in one batch
+    localized = LocalizedResponse("ipc", ipc_sections, text, translator)
+    t = localized.phrase
+
+    what_to_do = [
+        t('File complaint under this section'),
+        t('Register FIR at police station'),
+        t('Keep all evidence safe'),
+        t('Consult a lawyer')
+    ]
+    recommended_actions = [
+        t("File complaint at nearest police station"),
+        t("Keep all evidence safe"),
+        t("Get legal advice from a lawyer"),
+        t("Ensure your safety"),
+        t("Keep copy of FIR")
+    ]
+
     # ✅ Enhanced IPC Section Information in Regional Language
     translated_sections = []
     detailed_ipc_info = []
@@ -188,159 +233,158 @@ def process_audio_pipeline(audio_path, user_details, output_dir="static"):
     
     # Add header
     formatted_output.append("=" * 80)
-    formatted_output.append(f"🌐 {translator.translate('Your complaint matches the following IPC sections')} ({original_lang.upper()})")
+    formatted_output.append(f"🌐 {t('Your complaint matches the following IPC sections')} ({original_lang.upper()})")
     formatted_output.append("=" * 80)
     
-    for i, section in enumerate(ipc_sections, 1):
+    for i, section in enumerate(localized.sections, 1):
         # Create detailed regional language explanation with prominent section numbers
         regional_explanation = {
             "section_number": i,
-            "ipc_section": section['IPC Section'],
-            "name": translator.translate(section['Name']),
-            "description": translator.translate(section['Description']),
-            "punishment": translator.translate(section['Punishment']),
-            "bailability": translator.translate(section['Bailable/Non-Bailable']),
-            "cognizable": translator.translate(section['Cognizable/Non-Cognizable']),
-            "category": translator.translate(section['Category']),
-            "what_to_do": [
-                translator.translate('File complaint under this section'),
-                translator.translate('Register FIR at police station'),
-                translator.translate('Keep all evidence safe'),
-                translator.translate('Consult a lawyer')
-            ]
+            "ipc_section": section.section_id,
+            "name": section['Name'],
+            "description": section['Description'],
+            "punishment": section['Punishment'],
+            "bailability": section['Bailable/Non-Bailable'],
+            "cognizable": section['Cognizable/Non-Cognizable'],
+            "category": section['Category'],
+            "what_to_do": list(what_to_do)
         }
         
         # Create formatted text for frontend display
         formatted_section = f"""
-🔢 {translator.translate('Matched IPC Section')} {i}: {section['IPC Section']} - {translator.translate(section['Name'])}
+🔢 {t('Matched IPC Section')} {i}: {section.section_id} - {section['Name']}
 
-📝 {translator.translate('Description')}: {translator.translate(section['Description'])}
+📝 {t('Description')}: {section['Description']}
 
-⚖️ {translator.translate('Punishment')}: {translator.translate(section['Punishment'])}
+⚖️ {t('Punishment')}: {section['Punishment']}
 
-🧷 {translator.translate('Bailability')}: {translator.translate(section['Bailable/Non-Bailable'])}
+🧷 {t('Bailability')}: {section['Bailable/Non-Bailable']}
 
-🚓 {translator.translate('Cognizable')}: {translator.translate(section['Cognizable/Non-Cognizable'])}
+🚓 {t('Cognizable')}: {section['Cognizable/Non-Cognizable']}
 
-📂 {translator.translate('Category')}: {translator.translate(section['Category'])}
+📂 {t('Category')}: {section['Category']}
 
-🔍 {translator.translate('What to do')}:
-- {translator.translate('File complaint under this section')}
-- {translator.translate('Register FIR at police station')}
-- {translator.translate('Keep all evidence safe')}
-- {translator.translate('Consult a lawyer')}
+🔍 {t('What to do')}:
+- {what_to_do[0]}
+- {what_to_do[1]}
+- {what_to_do[2]}
+- {what_to_do[3]}
 """
         formatted_output.append(formatted_section)
         formatted_output.append("-" * 80)
         
-        # Create audio block for TTS
-        audio_block = (f"IPC Section: {section['IPC Section']} - {section['Name']}. "
-                      f"Description: {section['Description']}. "
-                      f"Punishment: {section['Punishment']}. "
-                      f"Bailable: {section['Bailable/Non-Bailable']}. "
-                      f"Cognizable: {section['Cognizable/Non-Cognizable']}. "
-                      f"Category: {section['Category']}.")
-        
-        translated_audio_block = translator.translate(audio_block)
-        translated_sections.append(translated_audio_block)
+        translated_sections.append(section.audio_block)
         detailed_ipc_info.append(regional_explanation)
 
-    # ✅ Generate comprehensive audio with all IPC details in regional language
-    comprehensive_audio_text = f"""
-{translator.translate('According to your complaint, the following IPC sections apply:')}
-
-{chr(10).join(translated_sections)}
-
-{translator.translate('Please take the following steps:')}
-1. {translator.translate('File complaint at nearest police station')}
-2. {translator.translate('Keep all evidence safe')}
-3. {translator.translate('Get legal advice from a lawyer')}
-4. {translator.translate('Ensure your safety')}
-5. {translator.translate('Keep copy of FIR')}
-"""
+    _notify(on_progress, "localized", 55, translated_texts=translated_sections, detailed_ipc_info=detailed_ipc_info)
+
+    # ✅ Narration in regional language, one segment per block (header, each section, the action list).
+    # Segments are synthesized and cached separately, so only text not yet spoken in this language hits TTS
+    audio_segments = [
+        t('According to your complaint, the following IPC sections apply:'),
+        *translated_sections,
+        f"""{t('Please take the following steps:')}
+1. {recommended_actions[0]}
+2. {recommended_actions[1]}
+3. {recommended_actions[2]}
+4. {recommended_actions[3]}
+5. {recommended_actions[4]}
+""",
+    ]
     
     os.makedirs(output_dir, exist_ok=True)
-    audio_file = speak_text(comprehensive_audio_text, original_lang, os.path.join(output_dir, "ipc_output.mp3"))
-
-    # ✅ Generate detailed PDFs with enhanced information
-    pdf_en = create_letter_pdf(
-        conditional_translate(user_details['name'], 'en'),
-        conditional_translate(user_details['location'], 'en'),
-        text, main_section, other_sections,
-        user_details['gender'], user_details['age'],
-        user_details['phone'], user_details['id_number'], user_details['email'],
-        original_lang='en', output_file=os.path.join(output_dir, "ipc_letter_english.pdf")
-    )
-
-    pdf_regional = create_letter_pdf(
-        conditional_translate(user_details['name'], original_lang),
-        conditional_translate(user_details['location'], original_lang),
-        translator.translate(text),
-        deep_translate_section(main_section, translator),
-        [deep_translate_section(sec, translator) for sec in other_sections],
-        user_details['gender'], user_details['age'],
-        user_details['phone'], user_details['id_number'], user_details['email'],
-        original_lang=original_lang, output_file=os.path.join(output_dir, "ipc_letter_regional.pdf")
-    )
+
+    # ✅ Audio and both PDFs are independent of each other, so they are built concurrently.
+    # Unique names so concurrent requests and background jobs never overwrite each other's files
+    def build_audio():
+        return speak_text(audio_segments, original_lang, os.path.join(output_dir, f"ipc_output_{uuid.uuid4()}.mp3"))
+
+    def build_pdf_english():
+        return create_letter_pdf(
+            conditional_translate(user_details['name'], 'en'),
+            conditional_translate(user_details['location'], 'en'),
+            text, main_section, other_sections,
+            user_details['gender'], user_details['age'],
+            user_details['phone'], user_details['id_number'], user_details['email'],
+            original_lang='en', output_file=os.path.join(output_dir, f"ipc_letter_english_{uuid.uuid4()}.pdf")
+        )
+
+    def build_pdf_regional():
+        return create_letter_pdf(
+            conditional_translate(user_details['name'], original_lang),
+            conditional_translate(user_details['location'], original_lang),
+            localized.transcript,
+            localized.sections[0].translated_section(),
+            [sec.translated_section() for sec in localized.sections[1:]],
+            user_details['gender'], user_details['age'],
+            user_details['phone'], user_details['id_number'], user_details['email'],
+            original_lang=original_lang, output_file=os.path.join(output_dir, f"ipc_letter_regional_{uuid.uuid4()}.pdf")
+        )
+
+    artifact_events = {
+        "audio": ("audio_ready", 70, "audio_url"),
+        "pdf_english": ("pdf_english_ready", 85, "pdf_english_url"),
+        "pdf_regional": ("pdf_regional_ready", 95, "pdf_regional_url"),
+    }
+
+    def on_artifact_done(name, outcome):
+        stage, progress, url_key = artifact_events[name]
+        path = outcome["value"]
+        _notify(on_progress, stage, progress, **{url_key: path.replace("static/", "/static/") if path else None})
+
+    artifacts = run_stages([
+        Stage("audio", build_audio),
+        Stage("pdf_english", build_pdf_english),
+        Stage("pdf_regional", build_pdf_regional),
+    ], on_done=on_artifact_done)
+    audio_file = artifacts["audio"]["value"]
+    pdf_en = artifacts["pdf_english"]["value"]
+    pdf_regional = artifacts["pdf_regional"]["value"]
 
     # ✅ Create detailed IPC summary in regional language
+    def summary_entry(section):
+        return {
+            "section_number": section.section_id,
+            "name": section['Name'],
+            "description": section['Description'],
+            "punishment": section['Punishment'],
+            "bailability": section['Bailable/Non-Bailable'],
+            "cognizable": section['Cognizable/Non-Cognizable'],
+            "category": section['Category']
+        }
+
     ipc_summary = {
         "total_sections_found": len(ipc_sections),
-        "main_section": {
-            "section_number": main_section['IPC Section'],
-            "name": translator.translate(main_section['Name']),
-            "description": translator.translate(main_section['Description']),
-            "punishment": translator.translate(main_section['Punishment']),
-            "bailability": translator.translate(main_section['Bailable/Non-Bailable']),
-            "cognizable": translator.translate(main_section['Cognizable/Non-Cognizable']),
-            "category": translator.translate(main_section['Category'])
-        },
-        "other_sections": [
-            {
-                "section_number": sec['IPC Section'],
-                "name": translator.translate(sec['Name']),
-                "description": translator.translate(sec['Description']),
-                "punishment": translator.translate(sec['Punishment']),
-                "bailability": translator.translate(sec['Bailable/Non-Bailable']),
-                "cognizable": translator.translate(sec['Cognizable/Non-Cognizable']),
-                "category": translator.translate(sec['Category'])
-            }
-            for sec in other_sections
-        ],
-        "recommended_actions": [
-            translator.translate("File complaint at nearest police station"),
-            translator.translate("Keep all evidence safe"),
-            translator.translate("Get legal advice from a lawyer"),
-            translator.translate("Ensure your safety"),
-            translator.translate("Keep copy of FIR")
-        ]
+        "main_section": summary_entry(localized.sections[0]),
+        "other_sections": [summary_entry(sec) for sec in localized.sections[1:]],
+        "recommended_actions": recommended_actions
     }
 
     # Add summary section to formatted output
     formatted_output.append("\n" + "=" * 80)
-    formatted_output.append(f"✅ {translator.translate('Processing completed successfully!')}")
+    formatted_output.append(f"✅ {t('Processing completed successfully!')}")
     formatted_output.append("=" * 80)
     
-    formatted_output.append(f"\n📁 {translator.translate('Generated Files')}:")
-    formatted_output.append(f"🎵 {translator.translate('Audio file')}: {audio_file}")
-    formatted_output.append(f"📄 {translator.translate('English PDF')}: {pdf_en}")
-    formatted_output.append(f"📄 {translator.translate('Regional PDF')}: {pdf_regional}")
+    formatted_output.append(f"\n📁 {t('Generated Files')}:")
+    formatted_output.append(f"🎵 {t('Audio file')}: {audio_file}")
+    formatted_output.append(f"📄 {t('English PDF')}: {pdf_en}")
+    formatted_output.append(f"📄 {t('Regional PDF')}: {pdf_regional}")
     
-    formatted_output.append(f"\n🌐 {translator.translate('Language Information')}:")
-    formatted_output.append(f"{translator.translate('Detected Language')}: {original_lang}")
-    formatted_output.append(f"{translator.translate('Regional Language')}: {original_lang}")
+    formatted_output.append(f"\n🌐 {t('Language Information')}:")
+    formatted_output.append(f"{t('Detected Language')}: {original_lang}")
+    formatted_output.append(f"{t('Regional Language')}: {original_lang}")
     
-    formatted_output.append(f"\n📝 {translator.translate('Transcribed Text')}:")
+    formatted_output.append(f"\n📝 {t('Transcribed Text')}:")
     formatted_output.append(f"{text}")
     
-    formatted_output.append(f"\n📊 {translator.translate('IPC Summary')}:")
-    formatted_output.append(f"{translator.translate('Total IPC Sections Found')}: {len(ipc_sections)}")
-    formatted_output.append(f"{translator.translate('Main Section')}: {ipc_sections[0]['IPC Section']} - {translator.translate(ipc_sections[0]['Name'])}")
+    formatted_output.append(f"\n📊 {t('IPC Summary')}:")
+    formatted_output.append(f"{t('Total IPC Sections Found')}: {len(ipc_sections)}")
+    formatted_output.append(f"{t('Main Section')}: {main_section['IPC Section']} - {localized.sections[0]['Name']}")
     
     if len(ipc_sections) > 1:
-        formatted_output.append(f"{translator.translate('Other Sections')}: {len(ipc_sections) - 1} {translator.translate('additional sections found')}")
+        formatted_output.append(f"{t('Other Sections')}: {len(ipc_sections) - 1} {t('additional sections found')}")
     
-    formatted_output.append(f"\n🔍 {translator.translate('Recommended Actions')}:")
+    formatted_output.append(f"\n🔍 {t('Recommended Actions')}:")
     for i, action in enumerate(ipc_summary['recommended_actions'], 1):
         formatted_output.append(f"{i}. {action}")
     
@@ -359,13 +403,16 @@ def process_audio_pipeline(audio_path, user_details, output_dir="static"):
         "transcribed_text": text,
         "formatted_output": complete_formatted_output,
         "detailed_ipc_info": detailed_ipc_info,
-        "ipc_summary": ipc_summary
+        "ipc_summary": ipc_summary,
+        "asr": asr_info,
+        "stage_timings": {name: outcome["seconds"] for name, outcome in artifacts.items()},
+        "stage_errors": {name: outcome["error"] for name, outcome in artifacts.items() if outcome["error"]}
     }
 
 # Main execution function for testing
 def main():
     # ✅ Install fonts
-    install_fonts()
+    provision_fonts()
     
     # Example usage
     audio_path = "test_audio.mp3"  # Replace with actual audio file
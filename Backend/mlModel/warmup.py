@@ -0,0 +1,113 @@
+# warmup.py
+#
+# Startup phase of a worker: provision fonts once, then push one synthetic
+# request through the served models (Whisper, the section encoder, the
+# scheme encoder; see Config.SERVED_MODELS) and the PDF renderer so lazy
+# initialisation, allocator growth and the PDF worker processes are paid for
+# before real traffic arrives. /readyz reports ready only once this has
+# finished and every served model has been loaded; with WARMUP_ON_STARTUP
+# off, models are loaded on demand and the worker is ready straight away.
+
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from mlModel.model_registry import has_loaded
+from mlModel.asr_backends import get_asr_backend
+from mlModel.encoders import encode
+
+SAMPLE_COMPLAINT = "Someone snatched my phone and purse at the bus stand and threatened me with a knife."
+
+_status = {"state": "pending", "steps": {}, "started_at": None, "finished_at": None}
+_status_lock = threading.Lock()
+
+# ----------------------------
+# Steps
+# ----------------------------
+def _warm_fonts():
+    from mlModel.pdf_renderer import provision_fonts
+    provision_fonts()
+
+def _warm_whisper():
+    import numpy as np  # type: ignore
+    # One second of silence at Whisper's 16 kHz sample rate
+    get_asr_backend().transcribe(np.zeros(16000, dtype=np.float32), task="translate")
+
+def _warm_sections():
+    from mlModel.voice_assistant import classify_ipc
+    from mlModel.bns_sections import classify_bns
+    classify_ipc(SAMPLE_COMPLAINT)
+    classify_bns(SAMPLE_COMPLAINT)
+
+def _warm_schemes():
+    # Goes through the encoder batcher so its dispatcher thread is running too
+    encode("scheme_encoder", SAMPLE_COMPLAINT)
+
+def _warm_pdf():
+    from mlModel.pdf_renderer import render_pdf
+    templates = ["ipc_complaint_template_en.html", "bns_complaint_template_en.html"]
+    # One render per PDF worker so every worker process has started and built its font configuration
+    renders = max(1, Config.PDF_RENDER_WORKERS)
+    with tempfile.TemporaryDirectory() as out_dir, ThreadPoolExecutor(max_workers=renders) as pool:
+        list(pool.map(
+            lambda i: render_pdf(templates[i % len(templates)], {}, os.path.join(out_dir, f"warmup_{i}.pdf")),
+            range(renders)
+        ))
+
+# (name, served model it needs or None, step); steps for models this deployment does not serve are skipped
+WARMUP_STEPS = [
+    ("fonts", None, _warm_fonts),
+    ("whisper", "asr", _warm_whisper),
+    ("sections", "query_encoder", _warm_sections),
+    ("schemes", "scheme_encoder", _warm_schemes),
+    ("pdf", None, _warm_pdf),
+]
+
+# ----------------------------
+# Public API
+# ----------------------------
+def served_models():
+    """Config.SERVED_MODELS with 'asr' resolved to the configured ASR backend's model."""
+    return [get_asr_backend().model_name if name == "asr" else name for name in Config.SERVED_MODELS]
+
+def warmup():
+    """Run every warmup step; returns the final status."""
+    with _status_lock:
+        _status.update(state="warming", steps={}, started_at=time.time(), finished_at=None)
+    failed = False
+    for name, model, step in WARMUP_STEPS:
+        if model is not None and model not in Config.SERVED_MODELS:
+            continue
+        started = time.perf_counter()
+        try:
+            step()
+            outcome = {"seconds": round(time.perf_counter() - started, 3), "error": None}
+        except Exception as e:
+            failed = True
+            outcome = {"seconds": round(time.perf_counter() - started, 3), "error": str(e)}
+            print(f"❌ Warmup step '{name}' failed: {e}")
+        with _status_lock:
+            _status["steps"][name] = outcome
+    with _status_lock:
+        _status.update(state="failed" if failed else "ready", finished_at=time.time())
+        total = _status["finished_at"] - _status["started_at"]
+    print(f"{'⚠️' if failed else '✅'} Warmup finished in {total:.1f}s")
+    return readiness()
+
+def start_warmup():
+    """Warm up in the background so the worker answers /healthz while it loads."""
+    thread = threading.Thread(target=warmup, name="warmup", daemon=True)
+    thread.start()
+    return thread
+
+def readiness():
+    with _status_lock:
+        status = {**_status, "steps": dict(_status["steps"])}
+    if not Config.WARMUP_ON_STARTUP:
+        # Nothing loads the models ahead of traffic: the first request that needs each one loads it
+        return {"ready": True, "missing_models": [], **status}
+    # Loaded at least once: an idle model unloaded under the memory budget is reloaded on demand
+    missing = [name for name in served_models() if not has_loaded(name)]
+    return {"ready": status["state"] == "ready" and not missing, "missing_models": missing, **status}
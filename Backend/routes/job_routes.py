@@ -0,0 +1,142 @@
+from flask import Blueprint, Response, request, jsonify, stream_with_context  # type: ignore
+from flask_jwt_extended import jwt_required, get_jwt_identity  # type: ignore
+from mlModel.voice_assistant import process_audio_pipeline as voice_pipeline
+from mlModel.bns_sections import process_audio_pipeline as bns_pipeline
+from mlModel.asr_backends import parse_asr_options
+from utils.audio_utils import ingest_audio, AudioRejected
+from utils.job_queue import job_queue, QueueFull
+from config import Config
+import json
+import os
+import time
+import uuid
+import numpy as np  # type: ignore
+
+# Initialize Blueprint
+job_bp = Blueprint('jobs', __name__)
+
+def _pipeline_runner(process_audio_pipeline):
+    def run(payload, report_progress):
+        try:
+            # Uploads are stored as decoded samples (.npy); older queued jobs still hold the raw file
+            audio_path = payload['audio_path']
+            audio = np.load(audio_path) if audio_path.endswith('.npy') else audio_path
+            return process_audio_pipeline(audio, payload['user_details'], on_progress=report_progress,
+                                          **payload.get('asr_options', {}))
+        finally:
+            # The upload is kept until the job finishes so a restart can re-run it
+            if os.path.exists(payload['audio_path']):
+                os.remove(payload['audio_path'])
+    return run
+
+job_queue.register('voice', _pipeline_runner(voice_pipeline))
+job_queue.register('bns', _pipeline_runner(bns_pipeline))
+
+def _submit(kind):
+    """Saves the upload and queues the pipeline; returns 202 with the job ID"""
+    audio_file = request.files.get('audio') or request.files.get('audio_file')
+    if not audio_file:
+        return jsonify({'error': 'No audio file provided'}), 400
+
+    user_details = {
+        'name': request.form.get('name', 'User'),
+        'location': request.form.get('location', 'Unknown'),
+        'age': request.form.get('age', '30'),
+        'gender': request.form.get('gender', 'Male'),
+        'phone': request.form.get('phone', 'NA'),
+        'id_number': request.form.get('id_number', 'NA'),
+        'email': request.form.get('email', 'user@example.com')
+    }
+
+    try:
+        asr_options = parse_asr_options(request.form.get('quality'), request.form.get('language'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # Decoded and trimmed up front, so oversized or undecodable uploads are rejected before queuing
+    try:
+        audio, audio_info = ingest_audio(audio_file.stream)
+    except AudioRejected as e:
+        return jsonify({'error': str(e)}), e.status
+
+    save_path = os.path.join('uploads', f"{uuid.uuid4()}.npy")
+    os.makedirs('uploads', exist_ok=True)
+    np.save(save_path, audio)
+
+    try:
+        job_id = job_queue.submit(kind, {'audio_path': save_path, 'user_details': user_details, 'asr_options': asr_options},
+                                  owner=get_jwt_identity())
+    except QueueFull as e:
+        os.remove(save_path)
+        return jsonify({'error': str(e)}), 503
+
+    return jsonify({'job_id': job_id, 'status': 'queued', 'status_url': f'/api/jobs/{job_id}',
+                    'audio_ingest': audio_info}), 202
+
+@job_bp.route('/jobs/voice-chat', methods=['POST'])
+@jwt_required()
+def submit_voice_job():
+    return _submit('voice')
+
+@job_bp.route('/jobs/bns-chat', methods=['POST'])
+@jwt_required()
+def submit_bns_job():
+    return _submit('bns')
+
+@job_bp.route('/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def job_status(job_id):
+    """Returns the job's status and progress, plus the pipeline result once done"""
+    job = job_queue.get(job_id)
+    if not job or job.pop('owner') != get_jwt_identity():
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@job_bp.route('/jobs/<job_id>/events', methods=['GET'])
+@jwt_required(locations=['headers', 'query_string'])  # EventSource cannot send headers, so ?jwt=... is accepted here
+def job_events(job_id):
+    """Server-Sent Events stream of a job's milestones as they finish"""
+    job = job_queue.get(job_id)
+    if not job or job['owner'] != get_jwt_identity():
+        return jsonify({'error': 'Job not found'}), 404
+
+    # Reconnecting clients resume after the last event they saw
+    try:
+        last_seq = int(request.headers.get('Last-Event-ID') or request.args.get('after', 0))
+    except ValueError:
+        return jsonify({'error': 'Last-Event-ID / after must be an event number'}), 400
+
+    def stream():
+        nonlocal last_seq
+        # Each open stream holds a request thread, so it is capped; the client reconnects where it left off
+        started = last_sent = time.monotonic()
+        poll_interval = Config.JOB_STREAM_POLL_MIN_SECONDS
+        while time.monotonic() - started < Config.JOB_STREAM_MAX_SECONDS:
+            # Both read before the events, so nothing recorded in the meantime is missed
+            seen = job_queue.events_recorded()
+            active = job_queue.is_active(job_id)
+            events = job_queue.events_since(job_id, last_seq)
+            for event in events:
+                last_seq = event['seq']
+                last_sent = time.monotonic()
+                payload = {'stage': event['stage'], 'progress': event['progress'], **event['data']}
+                yield f"id: {event['seq']}\nevent: {event['stage']}\ndata: {json.dumps(payload)}\n\n"
+                if event['stage'] in ('done', 'failed'):
+                    return
+            if not active:
+                # Finished without a terminal event, or its runner died; it is resumed when re-queued
+                job = job_queue.get(job_id)
+                yield f"event: interrupted\ndata: {json.dumps({'status': job['status'] if job else None})}\n\n"
+                return
+            if time.monotonic() - last_sent > 15:
+                # Comment line keeps proxies from closing an idle connection
+                last_sent = time.monotonic()
+                yield ": keep-alive\n\n"
+            # A job run by this worker wakes the stream as soon as it records an event; one run by another
+            # worker is polled, backing off while it is quiet so idle streams do not hammer the database
+            poll_interval = (Config.JOB_STREAM_POLL_MIN_SECONDS if events
+                             else min(poll_interval * 2, Config.JOB_STREAM_POLL_MAX_SECONDS))
+            job_queue.wait_for_event(seen, poll_interval)
+
+    return Response(stream_with_context(stream()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
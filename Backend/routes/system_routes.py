@@ -0,0 +1,41 @@
+from flask import Blueprint, jsonify  # type: ignore
+from mlModel.model_registry import resident_models
+from mlModel.translation_cache import translation_cache
+from mlModel.artifacts import artifact_store
+from mlModel.warmup import readiness
+from mlModel.batching import batcher_stats
+
+system_bp = Blueprint('system', __name__)
+# Probes for the load balancer, served at the root (no /api prefix)
+health_bp = Blueprint('health', __name__)
+
+@system_bp.route('/models', methods=['GET'])
+def models_status():
+    """Models loaded by this worker: residency, load count and latency, memory footprint"""
+    return jsonify(resident_models())
+
+@system_bp.route('/translation-cache', methods=['GET'])
+def translation_cache_stats():
+    """Hit/miss counters of this worker's translation cache"""
+    return jsonify(translation_cache.stats())
+
+@system_bp.route('/artifacts', methods=['GET'])
+def artifact_store_stats():
+    """Hit rate, blob count and size of the content-addressed artifact store"""
+    return jsonify(artifact_store.stats())
+
+@system_bp.route('/batching', methods=['GET'])
+def batching_stats():
+    """Queue-wait, batch-size and batch-time histograms of this worker's micro-batchers"""
+    return jsonify(batcher_stats())
+
+@health_bp.route('/healthz', methods=['GET'])
+def healthz():
+    """Liveness: the worker process is up and answering"""
+    return jsonify({'status': 'ok'})
+
+@health_bp.route('/readyz', methods=['GET'])
+def readyz():
+    """Readiness: warmup finished and every required model is resident (503 until then)"""
+    report = readiness()
+    return jsonify(report), 200 if report['ready'] else 503
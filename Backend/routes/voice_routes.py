@@ -1,8 +1,8 @@
 from flask import Blueprint, request, jsonify # type: ignore
 from flask_jwt_extended import jwt_required  # type: ignore
 from mlModel.voice_assistant import process_audio_pipeline  # Import your ML pipeline
-import os
-import uuid
+from mlModel.asr_backends import parse_asr_options
+from utils.audio_utils import ingest_audio, AudioRejected
 
 # Initialize Blueprint
 voice_bp = Blueprint('voice', __name__)
@@ -34,14 +34,20 @@ def voice_chat():
             'email': request.form.get('email', 'user@example.com')
         }
 
-        # Save uploaded audio with unique filename
-        unique_filename = f"{uuid.uuid4()}_{audio_file.filename}"
-        save_path = os.path.join('uploads', unique_filename)
-        os.makedirs('uploads', exist_ok=True)
-        audio_file.save(save_path)
+        # Decoding profile (fast/balanced/accurate) and optional language hint
+        try:
+            asr_options = parse_asr_options(request.form.get('quality'), request.form.get('language'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        # Decode the upload in memory (16 kHz mono, silence trimmed) - no temp file
+        try:
+            audio, audio_info = ingest_audio(audio_file.stream)
+        except AudioRejected as e:
+            return jsonify({'error': str(e)}), e.status
 
         # Process audio with ML pipeline
-        result = process_audio_pipeline(save_path, user_details)
+        result = process_audio_pipeline(audio, user_details, **asr_options)
         
         # Debug: Print the result keys
         print(f"Result keys: {list(result.keys())}")
@@ -49,10 +55,6 @@ def voice_chat():
         print(f"PDF English: {result.get('pdf_english_url')}")
         print(f"PDF Regional: {result.get('pdf_regional_url')}")
 
-        # Clean up uploaded file
-        if os.path.exists(save_path):
-            os.remove(save_path)
-
         # Return results with URLs - use the exact field names from voice_assistant.py
         return jsonify({
             "success": True,
@@ -64,7 +66,9 @@ def voice_chat():
             "audio_url": result.get('audio_url', ''),  # Already has /static/ prefix
             "pdf_english_url": result.get('pdf_english_url', ''),  # Already has /static/ prefix
             "pdf_regional_url": result.get('pdf_regional_url', ''),  # Already has /static/ prefix
-            "formatted_output": result.get('formatted_output', '')
+            "formatted_output": result.get('formatted_output', ''),
+            "asr": result.get('asr'),  # decoding profile used and decode time
+            "audio_ingest": audio_info  # upload duration and how much silence was trimmed
         })
 
     except Exception as e:
@@ -0,0 +1,65 @@
+# serving.py
+#
+# Pre-fork model serving. The gunicorn master imports the app, loads every
+# model and embedding index once and freezes the garbage collector, then
+# forks the workers: their model weights stay copy-on-write pages shared
+# with the master instead of N private copies. Each worker then sets its
+# own torch thread count, starts the threads fork did not carry over
+# (job queue, warmup, micro-batch dispatchers) and is recycled once it has
+# served WORKER_MAX_REQUESTS requests or its unshared memory grows past
+# WORKER_MAX_PRIVATE_BYTES. The hooks are wired up in gunicorn.conf.py.
+
+import gc
+import os
+from config import Config
+from mlModel.model_registry import pin_model, private_bytes, current_rss_bytes
+
+# ----------------------------
+# Sizing
+# ----------------------------
+def torch_threads_per_worker():
+    return Config.WORKER_TORCH_THREADS or max(1, (os.cpu_count() or 1) // max(1, Config.SERVER_WORKERS))
+
+# ----------------------------
+# Master
+# ----------------------------
+def preload():
+    """Load every model the workers serve with, in the master, before it forks."""
+    from mlModel.warmup import served_models
+    # Only loading happens here: no inference, so no torch thread pool exists yet to be broken by fork.
+    # Pinned, because these pages are shared with every worker: unloading one would free nothing
+    for name in served_models():
+        pin_model(name)
+    # The pipelines load their memory-mapped embedding indexes and section catalogs on import
+    import mlModel.voice_assistant  # noqa: F401
+    import mlModel.bns_sections  # noqa: F401
+    import mlModel.schemes  # noqa: F401
+    gc.collect()
+    # Move everything loaded so far out of the collector's reach, so a worker's collections
+    # do not write to (and thereby copy) the pages of objects shared with the master
+    gc.freeze()
+    rss = current_rss_bytes()
+    print(f"✅ Preloaded models for the workers ({rss / 2**20:.0f} MiB resident)" if rss else "✅ Preloaded models")
+
+# ----------------------------
+# Worker
+# ----------------------------
+def after_fork():
+    """Per-worker setup that cannot be inherited from the master."""
+    import torch  # type: ignore
+    torch.set_num_threads(torch_threads_per_worker())
+
+    # Process pools hold pipes and a management thread of the master; start fresh ones on demand
+    from mlModel import pdf_renderer
+    pdf_renderer._pool = None
+
+    from application import start_background_work
+    start_background_work()
+
+def should_recycle():
+    """True once this worker's unshared memory exceeds WORKER_MAX_PRIVATE_BYTES."""
+    limit = Config.WORKER_MAX_PRIVATE_BYTES
+    if not limit:
+        return False
+    used = private_bytes()
+    return used is not None and used > limit
@@ -0,0 +1,164 @@
+# audio_utils.py
+#
+# In-memory ingestion of uploaded audio. The upload stream is piped through
+# ffmpeg straight to 16 kHz mono float32 (the array Whisper expects), without
+# a temp file, while enforcing a maximum upload size and duration (files
+# ffmpeg cannot read from a pipe are retried from a spooled copy). Leading
+# and trailing silence is then trimmed by frame energy so ASR does not spend
+# time on it.
+
+import shutil
+import subprocess
+import tempfile
+import threading
+from collections import deque
+import numpy as np  # type: ignore
+from config import Config
+
+SAMPLE_RATE = 16000
+_CHUNK_BYTES = 64 * 1024
+_SPOOL_MEMORY_BYTES = 8 * 1024 * 1024  # uploads are kept for a retry in memory up to this, then on disk
+_STDERR_TAIL_LINES = 20
+
+
+class AudioRejected(ValueError):
+    """The upload is too large, too long or not decodable; `status` is the HTTP code to answer with."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _run_ffmpeg(source, max_pcm_bytes, max_seconds, stream=None, max_bytes=None, spool=None):
+    """
+    Decode `source` (a path, or "pipe:0" fed from `stream`) to s16le PCM.
+    While feeding, the upload is also copied to `spool` so it can be decoded
+    again from a seekable file. Returns (pcm, returncode, stderr tail, too_large).
+    """
+    process = subprocess.Popen(
+        ["ffmpeg", "-nostdin", "-loglevel", "error", "-threads", "0", "-i", source,
+         "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"],
+        stdin=subprocess.PIPE if stream is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    too_large = threading.Event()
+    errors = deque(maxlen=_STDERR_TAIL_LINES)
+
+    def feed():
+        # Runs beside the reader so neither pipe can fill up and stall ffmpeg
+        received, piping = 0, True
+        try:
+            while True:
+                chunk = stream.read(_CHUNK_BYTES)
+                if not chunk:
+                    break
+                received += len(chunk)
+                if received > max_bytes:
+                    too_large.set()
+                    process.kill()
+                    break
+                spool.write(chunk)
+                if piping:
+                    try:
+                        process.stdin.write(chunk)
+                    except (BrokenPipeError, OSError):
+                        # ffmpeg gave up (e.g. an MP4 index at the end); keep spooling for the retry
+                        piping = False
+        finally:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+
+    def drain_stderr():
+        # Read continuously (keeping only the tail) so a chatty ffmpeg never blocks on a full pipe
+        for line in process.stderr:
+            errors.append(line.decode("utf-8", "replace").strip())
+
+    threads = [threading.Thread(target=drain_stderr, name="audio-stderr", daemon=True)]
+    if stream is not None:
+        threads.append(threading.Thread(target=feed, name="audio-feed", daemon=True))
+    for thread in threads:
+        thread.start()
+    pcm = bytearray()
+    while True:
+        chunk = process.stdout.read(_CHUNK_BYTES)
+        if not chunk:
+            break
+        pcm.extend(chunk)
+        if len(pcm) > max_pcm_bytes:
+            process.kill()
+            for thread in threads:
+                thread.join()
+            process.wait()
+            raise AudioRejected(f"Audio is longer than {max_seconds:.0f} seconds", status=413)
+    for thread in threads:
+        thread.join()
+    returncode = process.wait()
+    return pcm, returncode, " ".join(line for line in errors if line), too_large.is_set()
+
+
+def decode_audio(stream, max_bytes=None, max_seconds=None):
+    """Decode a file-like upload to 16 kHz mono float32 samples in [-1, 1]."""
+    max_bytes = max_bytes or Config.AUDIO_MAX_BYTES
+    max_seconds = max_seconds or Config.AUDIO_MAX_SECONDS
+    max_pcm_bytes = int(max_seconds * SAMPLE_RATE) * 2
+
+    with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MEMORY_BYTES) as spool:
+        pcm, returncode, error, too_large = _run_ffmpeg(
+            "pipe:0", max_pcm_bytes, max_seconds, stream=stream, max_bytes=max_bytes, spool=spool
+        )
+        if too_large:
+            raise AudioRejected(f"Audio upload is larger than {max_bytes // (1024 * 1024)} MB", status=413)
+        if returncode != 0 or not pcm:
+            # Containers whose index comes last (MP4/M4A/MOV with the moov atom at the end, as phone
+            # voice memos often are) cannot be read from a pipe; decode them again from a seekable file
+            spool.seek(0)
+            with tempfile.NamedTemporaryFile(suffix=".upload") as f:
+                shutil.copyfileobj(spool, f)
+                f.flush()
+                pcm, returncode, error, _ = _run_ffmpeg(f.name, max_pcm_bytes, max_seconds)
+
+    if returncode != 0 or not pcm:
+        raise AudioRejected(f"Could not decode audio: {error or 'no audio stream'}")
+    # Same scaling as whisper.load_audio
+    return np.frombuffer(bytes(pcm[:len(pcm) // 2 * 2]), np.int16).astype(np.float32) / 32768.0
+
+
+def frame_rms(audio, frame_ms=30):
+    """RMS energy of consecutive `frame_ms` frames (a trailing partial frame is ignored)."""
+    frame = SAMPLE_RATE * frame_ms // 1000
+    frames = len(audio) // frame
+    return np.sqrt(np.mean(np.square(audio[:frames * frame].reshape(frames, frame)), axis=1))
+
+
+def trim_silence(audio, threshold_db=None, frame_ms=30, pad_ms=200):
+    """
+    Drop leading and trailing frames quieter than `threshold_db` relative to
+    the loudest frame, keeping `pad_ms` around the speech. Audio with no
+    frame above the threshold is returned unchanged.
+    """
+    threshold_db = Config.AUDIO_SILENCE_THRESHOLD_DB if threshold_db is None else threshold_db
+    frame = SAMPLE_RATE * frame_ms // 1000
+    rms = frame_rms(audio, frame_ms)
+    if len(rms) == 0:
+        return audio
+    peak = rms.max()
+    if peak <= 0:
+        return audio
+    voiced = np.flatnonzero(rms >= peak * 10 ** (threshold_db / 20))
+    pad = SAMPLE_RATE * pad_ms // 1000
+    start = max(0, voiced[0] * frame - pad)
+    end = min(len(audio), (voiced[-1] + 1) * frame + pad)
+    return audio[start:end]
+
+
+def ingest_audio(stream):
+    """Decode and trim an upload; returns (samples, info) with the durations before/after trimming."""
+    audio = decode_audio(stream)
+    trimmed = trim_silence(audio)
+    info = {
+        "duration_seconds": round(len(audio) / SAMPLE_RATE, 2),
+        "trimmed_seconds": round((len(audio) - len(trimmed)) / SAMPLE_RATE, 2),
+    }
+    return trimmed, info
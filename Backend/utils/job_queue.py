@@ -0,0 +1,233 @@
+# job_queue.py
+#
+# Background jobs for the complaint pipelines. A submit returns a job ID
+# straight away; a bounded thread pool runs the pipeline and records its
+# progress and result in SQLite, so clients can poll and jobs survive a
+# restart (unfinished jobs are re-queued by resume()). Every milestone is
+# also appended to an event log that the SSE endpoint streams from.
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+
+
+class QueueFull(Exception):
+    pass
+
+
+class JobQueue:
+    def __init__(self, db_path, workers=2, max_depth=16):
+        self.db_path = db_path
+        self.max_depth = max_depth
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._runners = {}
+        self._active = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # Bumped on every event this process records, so SSE streams of local jobs wake up at once
+        self._events_recorded = 0
+        self._event_recorded = threading.Condition()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY, kind TEXT, owner TEXT, status TEXT,"
+                " stage TEXT, progress INTEGER, payload TEXT, result TEXT, error TEXT,"
+                " runner_pid INTEGER, created_at REAL, updated_at REAL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_events ("
+                " job_id TEXT, seq INTEGER, stage TEXT, progress INTEGER, data TEXT, created_at REAL,"
+                " PRIMARY KEY (job_id, seq))"
+            )
+
+    def _connect(self):
+        # One connection per thread and per process (connections must not cross a fork); WAL lets the
+        # SSE streams' reads run alongside the claim and event writes of other workers
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _record_event(self, job_id, stage, progress, data=None, **fields):
+        """Append a milestone to the job's event log and update its status row."""
+        now = time.time()
+        with self._connect() as conn:
+            seq = conn.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM job_events WHERE job_id = ?", (job_id,)).fetchone()[0]
+            conn.execute(
+                "INSERT INTO job_events VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, seq, stage, progress, json.dumps(data or {}), now)
+            )
+            fields.update(stage=stage, progress=progress, updated_at=now)
+            assignments = ", ".join(f"{name} = ?" for name in fields)
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+        with self._event_recorded:
+            self._events_recorded += 1
+            self._event_recorded.notify_all()
+
+    def register(self, kind, runner):
+        """runner(payload, report_progress) -> JSON-serialisable result
+
+        report_progress(stage, progress, data=None) records a milestone; `data`
+        holds whatever the stage produced (transcript, sections, file URLs...).
+        """
+        self._runners[kind] = runner
+
+    # ----------------------------
+    # Submit / poll
+    # ----------------------------
+    def submit(self, kind, payload, owner=None):
+        with self._lock:
+            if self._active >= self.max_depth:
+                raise QueueFull(f"Job queue is full ({self.max_depth} jobs pending)")
+            self._active += 1
+        job_id = str(uuid.uuid4())
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, owner, status, stage, progress, payload, created_at, updated_at)"
+                " VALUES (?, ?, ?, 'queued', 'queued', 0, ?, ?, ?)",
+                (job_id, kind, owner, json.dumps(payload), now, now)
+            )
+        self._pool.submit(self._run, job_id)
+        return job_id
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "job_id": row["id"],
+            "kind": row["kind"],
+            "owner": row["owner"],
+            "status": row["status"],
+            "stage": row["stage"],
+            "progress": row["progress"],
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+
+    def events_since(self, job_id, after_seq=0):
+        """Events of a job with seq > after_seq, oldest first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT seq, stage, progress, data FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after_seq)
+            ).fetchall()
+        return [
+            {"seq": row["seq"], "stage": row["stage"], "progress": row["progress"], "data": json.loads(row["data"])}
+            for row in rows
+        ]
+
+    def events_recorded(self):
+        """Number of events recorded by this process so far; pass it to wait_for_event."""
+        return self._events_recorded
+
+    def wait_for_event(self, seen, timeout):
+        """Block until this process records an event after `seen` was read, or `timeout` seconds pass.
+
+        Events recorded by other worker processes do not wake the caller; it just times out.
+        """
+        with self._event_recorded:
+            self._event_recorded.wait_for(lambda: self._events_recorded != seen, timeout)
+
+    def is_active(self, job_id):
+        """False once the job has finished, or while its runner process is dead (until it is re-queued)."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT status, runner_pid FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None or row["status"] not in ('queued', 'running'):
+            return False
+        return row["status"] == 'queued' or row["runner_pid"] == os.getpid() or _pid_alive(row["runner_pid"])
+
+    # ----------------------------
+    # Execution
+    # ----------------------------
+    def _claim(self, job_id):
+        # Several workers may resume the same jobs after a restart; only one may run each
+        with self._connect() as conn:
+            claimed = conn.execute(
+                "UPDATE jobs SET status = 'running', runner_pid = ?, updated_at = ?"
+                " WHERE id = ? AND status = 'queued'",
+                (os.getpid(), time.time(), job_id)
+            ).rowcount
+            row = conn.execute("SELECT kind, payload FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row if claimed else None
+
+    def _run(self, job_id):
+        try:
+            row = self._claim(job_id)
+            if row is None:
+                return
+
+            def report_progress(stage, progress, data=None):
+                self._record_event(job_id, stage, progress, data)
+
+            self._record_event(job_id, "started", 0)
+            try:
+                result = self._runners[row["kind"]](json.loads(row["payload"]), report_progress)
+                self._record_event(job_id, "done", 100, result, status="done", result=json.dumps(result))
+            except Exception as e:
+                import traceback
+                print(f"Job {job_id} failed: {e}\n{traceback.format_exc()}")
+                self._record_event(job_id, "failed", None, {"error": str(e)}, status="failed", error=str(e))
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def resume(self):
+        """Re-queue jobs left unfinished by a previous process."""
+        with self._connect() as conn:
+            for row in conn.execute("SELECT id, runner_pid FROM jobs WHERE status = 'running'").fetchall():
+                if not _pid_alive(row["runner_pid"]):
+                    conn.execute("UPDATE jobs SET status = 'queued' WHERE id = ? AND status = 'running'", (row["id"],))
+            pending = [row["id"] for row in conn.execute("SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at")]
+        for job_id in pending:
+            with self._lock:
+                self._active += 1
+            self._pool.submit(self._run, job_id)
+        if pending:
+            print(f"✅ Re-queued {len(pending)} unfinished jobs")
+
+    def requeue_runner(self, pid):
+        """Put the jobs a dead worker process was running back in the queue; returns their IDs."""
+        requeued = []
+        with self._connect() as conn:
+            running = [row["id"] for row in conn.execute(
+                "SELECT id FROM jobs WHERE status = 'running' AND runner_pid = ?", (pid,)
+            )]
+            for job_id in running:
+                # Conditional, like _claim: a job that just finished is left alone
+                if conn.execute(
+                    "UPDATE jobs SET status = 'queued', runner_pid = NULL WHERE id = ? AND status = 'running' AND runner_pid = ?",
+                    (job_id, pid)
+                ).rowcount:
+                    requeued.append(job_id)
+        for job_id in requeued:
+            self._record_event(job_id, "requeued", 0)
+        return requeued
+
+
+def _pid_alive(pid):
+    if not pid:
+        return False
+    if pid == os.getpid():
+        # Our own PID from a previous process that has since been replaced
+        return False
+    try:
+        os.kill(pid, 0)
+        return True
+    except OSError:
+        return False
+
+
+job_queue = JobQueue(Config.JOBS_DB_PATH, workers=Config.JOB_WORKERS, max_depth=Config.JOB_QUEUE_DEPTH)
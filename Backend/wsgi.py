@@ -0,0 +1,12 @@
+# wsgi.py
+#
+# WSGI entry point. Under gunicorn.conf.py the app is imported once in the
+# master (preload) and forked into the workers, which start their own
+# background threads; any other WSGI server can serve `app` from here as
+# well, and then the threads are started on import.
+
+from config import Config
+from application import app, start_background_work  # noqa: F401
+
+if not Config.PREFORK:
+    start_background_work()